@@ -0,0 +1,131 @@
+"""
+ Copyright (c) 2020 Alan Yorinks All rights reserved.
+
+ This program is free software; you can redistribute it and/or
+ modify it under the terms of the GNU AFFERO GENERAL PUBLIC LICENSE
+ Version 3 as published by the Free Software Foundation; either
+ or (at your option) any later version.
+ This library is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+ General Public License for more details.
+
+ You should have received a copy of the GNU AFFERO GENERAL PUBLIC LICENSE
+ along with this library; if not, write to the Free Software
+ Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+ Helpers shared by the example programs.
+"""
+
+import asyncio
+import atexit
+import io
+import signal
+import sys
+import time
+
+# the most recently formatted second and its formatted string
+_fmt_cache = (None, '')
+
+
+def fmt_ts(time_stamp):
+    """
+    Format a callback time stamp as 'YYYY-MM-DD HH:MM:SS'.
+
+    Reports arriving within the same second share a formatted string,
+    so only the first report of each second is formatted.
+
+    :param time_stamp: raw time stamp from the callback data
+
+    :return: formatted time string
+    """
+    global _fmt_cache
+    seconds = int(time_stamp)
+    if seconds != _fmt_cache[0]:
+        _fmt_cache = (seconds, time.strftime('%Y-%m-%d %H:%M:%S',
+                                             time.localtime(seconds)))
+    return _fmt_cache[1]
+
+
+# lines queued by buffered_print, and whether a flush is scheduled
+_out_buffer = io.StringIO()
+_flush_pending = False
+
+
+def buffered_print(text):
+    """
+    Queue a line of text for output. Queued lines are written to
+    stdout together, at most 100 ms after the first one was queued.
+
+    This must be called from within the running event loop, for
+    example from a telemetrix_aio callback.
+
+    :param text: the line to print
+    """
+    global _flush_pending
+    _out_buffer.write(text)
+    _out_buffer.write('\n')
+    if not _flush_pending:
+        _flush_pending = True
+        asyncio.get_running_loop().call_later(.1, _flush)
+
+
+def _flush():
+    """
+    Write out all lines queued by buffered_print.
+    """
+    global _flush_pending
+    _flush_pending = False
+    sys.stdout.write(_out_buffer.getvalue())
+    sys.stdout.flush()
+    _out_buffer.seek(0)
+    _out_buffer.truncate()
+
+
+# do not lose lines still queued when the program ends
+atexit.register(_flush)
+
+
+async def wait_for_ctrl_c(board=None):
+    """
+    Wait for a Control-C, then shut down the board if one is given.
+
+    Signal handlers are not supported on Windows. There this waits
+    forever, and a KeyboardInterrupt ends the program instead.
+
+    :param board: telemetrix_aio instance to shut down
+    """
+    stop = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGINT, stop.set)
+    except NotImplementedError:
+        pass
+    await stop.wait()
+    if board:
+        await board.shutdown()
+
+
+def run(main):
+    """
+    Run the main() coroutine function of an example. The faster uvloop
+    event loop is used when it is installed. Control-C ends the program
+    quietly.
+
+    :param main: the example's main coroutine function
+    """
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
+    try:
+        if uvloop is None:
+            asyncio.run(main())
+        elif sys.version_info >= (3, 11):
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                runner.run(main())
+        else:
+            uvloop.install()
+            asyncio.run(main())
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -16,11 +16,11 @@
 """
 
 import asyncio
-import sys
-import time
 
 from telemetrix_aio import telemetrix_aio
 
+from _util import buffered_print, fmt_ts, run, wait_for_ctrl_c
+
 """
 This file demonstrates analog input using both callbacks and
 polling. Time stamps are provided in both "cooked" and raw form
@@ -43,10 +43,10 @@ async def the_callback(data):
     :param data: [pin_mode, pin, current_reported_value,  timestamp]
     """
 
-    formatted_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[CB_TIME]))
-    print(f'Analog Call Input Callback: pin={data[CB_PIN]}, '
-          f'Value={data[CB_VALUE]} Time={formatted_time} '
-          f'(Raw Time={data[CB_TIME]})')
+    formatted_time = fmt_ts(data[CB_TIME])
+    buffered_print(f'Analog Call Input Callback: pin={data[CB_PIN]}, '
+                   f'Value={data[CB_VALUE]} Time={formatted_time} '
+                   f'(Raw Time={data[CB_TIME]})')
 
 
 async def analog_in(my_board, pin):
@@ -74,26 +74,22 @@ async def analog_in(my_board, pin):
     # await asyncio.sleep(5)
     # await my_board.enable_analog_reporting()
 
-    # run forever waiting for input changes
-    try:
-        while True:
-            await asyncio.sleep(.001)
+    # wait for a Control-C to end the program
+    await wait_for_ctrl_c(my_board)
 
-    except KeyboardInterrupt:
-        await my_board.shutdown()
-        sys.exit(0)
 
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
+    try:
+        # start the main function
+        await analog_in(board, ANALOG_PIN)
+    except (KeyboardInterrupt, RuntimeError, asyncio.CancelledError):
+        await board.shutdown()
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
 
-try:
-    # start the main function
-    loop.run_until_complete(analog_in(board, ANALOG_PIN))
-except (KeyboardInterrupt, RuntimeError) as e:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
@@ -15,10 +15,11 @@
  Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 """
 import asyncio
-import sys
 
 from telemetrix_aio import telemetrix_aio
 
+from _util import run
+
 """
 Setup a pin for digital output and output a signal
 and toggle the pin. Do this 4 times.
@@ -49,16 +50,18 @@ async def blink(my_board, pin):
         await asyncio.sleep(1)
 
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await blink(board, DIGITAL_PIN)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
 
-try:
-    # start the main function
-    loop.run_until_complete(blink(board, DIGITAL_PIN))
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
@@ -16,15 +16,20 @@
 """
 
 import asyncio
-import sys
-import time
+import logging
 
 from telemetrix_aio import telemetrix_aio
 
+from _util import fmt_ts, run, wait_for_ctrl_c
+
 """
 This program monitors two DHT22 and two DHT11 sensors.
 """
 
+# reports are output through logging so that the message
+# is only formatted when it is actually going to be emitted
+logger = logging.getLogger(__name__)
+
 
 # indices into callback data for valid data
 # REPORT_TYPE = 0
@@ -57,14 +62,12 @@ async def the_callback(data):
         """
     if data[1]:
         # error message
-        date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[4]))
-        print(f'DHT Error Report:'
-              f'Pin: {data[2]} DHT Type: {data[3]} Error: {data[1]}  Time: {date}')
+        logger.info('DHT Error Report:Pin: %s DHT Type: %s Error: %s  Time: %s',
+                    data[2], data[3], data[1], fmt_ts(data[4]))
     else:
-        date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[6]))
-        print(f'DHT Valid Data Report:'
-              f'Pin: {data[2]} DHT Type: {data[3]} Humidity: {data[4]} Temperature:'
-              f' {data[5]} Time: {date}')
+        logger.info('DHT Valid Data Report:Pin: %s DHT Type: %s Humidity: %s '
+                    'Temperature: %s Time: %s',
+                    data[2], data[3], data[4], data[5], fmt_ts(data[6]))
 
 
 async def dht(my_board):
@@ -78,27 +81,31 @@ async def dht(my_board):
         """
 
     # set the pin mode for the DHT devices
-    await my_board.set_pin_mode_dht(8, the_callback, 11)
-    await my_board.set_pin_mode_dht(9, the_callback, 22)
-    await my_board.set_pin_mode_dht(10, the_callback, 22)
-    await my_board.set_pin_mode_dht(11, the_callback, 11)
-
-    # just sit in a loop waiting for the reports to come in
-    while True:
-        try:
-            await asyncio.sleep(.001)
-        except KeyboardInterrupt:
-            my_board.shutdown()
-            sys.exit(0)
-
-
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
-
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
-try:
-    loop.run_until_complete(dht(board))
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
+    await asyncio.gather(
+        my_board.set_pin_mode_dht(8, the_callback, 11),
+        my_board.set_pin_mode_dht(9, the_callback, 22),
+        my_board.set_pin_mode_dht(10, the_callback, 22),
+        my_board.set_pin_mode_dht(11, the_callback, 11),
+    )
+
+    # wait for a Control-C to end the program
+    await wait_for_ctrl_c(my_board)
+
+
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await dht(board)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    run(main)
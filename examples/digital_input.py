@@ -19,11 +19,11 @@
 """
 
 import asyncio
-import sys
-import time
 
 from telemetrix_aio import telemetrix_aio
 
+from _util import buffered_print, fmt_ts, run, wait_for_ctrl_c
+
 """
 Monitor a digital input pin
 """
@@ -50,8 +50,9 @@ async def the_callback(data):
 
     :param data: [pin_mode, pin, current reported value, timestamp]
     """
-    date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[CB_TIME]))
-    print(f'Pin: {data[CB_PIN]} Value: {data[CB_VALUE]} Time Stamp: {date}')
+    date = fmt_ts(data[CB_TIME])
+    buffered_print(f'Pin: {data[CB_PIN]} Value: {data[CB_VALUE]} '
+                   f'Time Stamp: {date}')
 
 
 async def digital_in(my_board, pin):
@@ -77,23 +78,22 @@ async def digital_in(my_board, pin):
     # await my_board.enable_digital_reporting(pin)
     # await asyncio.sleep(1)
 
-    while True:
-        try:
-            await asyncio.sleep(.001)
-        except KeyboardInterrupt:
-            await board.shutdown()
-            sys.exit(0)
-
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
-
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
-
-try:
-    # start the main function
-    loop.run_until_complete(digital_in(board, 12))
-except (KeyboardInterrupt, RuntimeError) as e:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+    # wait for a Control-C to end the program
+    await wait_for_ctrl_c(my_board)
+
+
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await digital_in(board, 12)
+    except (KeyboardInterrupt, RuntimeError, asyncio.CancelledError):
+        await board.shutdown()
+
+
+if __name__ == '__main__':
+    run(main)
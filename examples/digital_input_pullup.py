@@ -16,18 +16,17 @@
 """
 
 import asyncio
-import sys
-import time
 
 from telemetrix_aio import telemetrix_aio
 
+from _util import buffered_print, fmt_ts, run, wait_for_ctrl_c
+
 """
 Setup a digital pin for input pullup and monitor its changes.
 """
 
 # some globals
 DIGITAL_PIN = 12  # arduino pin number
-KILL_TIME = 5  # sleep time to keep forever loop open
 
 # Callback data indices
 # Callback data indices
@@ -47,8 +46,8 @@ async def the_callback(data):
 
     :param data: [pin, current reported value, pin_mode, timestamp]
     """
-    date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[CB_TIME]))
-    print(f'Pin: {data[CB_PIN]} Value: {data[CB_VALUE]} Time Stamp: {date}')
+    date = fmt_ts(data[CB_TIME])
+    buffered_print(f'Pin: {data[CB_PIN]} Value: {data[CB_VALUE]} Time Stamp: {date}')
 
 
 async def digital_in_pullup(my_board, pin):
@@ -64,25 +63,22 @@ async def digital_in_pullup(my_board, pin):
     # start monitoring the pin by setting its mode
     await my_board.set_pin_mode_digital_input_pullup(pin, the_callback)
 
-    # get pin changes forever
-    while True:
-        try:
-            await asyncio.sleep(KILL_TIME)
-        except KeyboardInterrupt:
-            await board.shutdown()
-            sys.exit(0)
+    # wait for a Control-C to end the program
+    await wait_for_ctrl_c(my_board)
+
 
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
+    try:
+        # start the main function
+        await digital_in_pullup(board, 12)
+    except (KeyboardInterrupt, RuntimeError, asyncio.CancelledError):
+        await board.shutdown()
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
 
-try:
-    # start the main function
-    loop.run_until_complete(digital_in_pullup(board, 12))
-except (KeyboardInterrupt, RuntimeError) as e:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
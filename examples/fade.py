@@ -19,11 +19,12 @@
 """
 
 import sys
-import time
 import asyncio
 
 from telemetrix_aio import telemetrix_aio
 
+from _util import run
+
 """
 Setup a pin for output and fade its intensity
 """
@@ -32,6 +33,11 @@ Setup a pin for output and fade its intensity
 # make sure to select a PWM pin
 DIGITAL_PIN = 6
 
+# number of PWM levels to advance per write.
+# the sleep between writes is scaled to match so that
+# a full fade takes the same amount of time
+FADE_STEP = 4
+
 
 async def fade(the_board, pin):
     # Set the DIGITAL_PIN as an output pin
@@ -43,27 +49,34 @@ async def fade(the_board, pin):
 
     try:
         print('Fading up...')
-        for i in range(255):
+        for i in range(0, 255, FADE_STEP):
             await the_board.analog_write(DIGITAL_PIN, i)
-            await asyncio.sleep(.005)
+            await asyncio.sleep(.005 * FADE_STEP)
+        # the steps may not land on the end points, so finish at full on
+        await the_board.analog_write(DIGITAL_PIN, 255)
         print('Fading down...')
-        for i in range(255, -1, -1):
+        for i in range(255, 0, -FADE_STEP):
             await the_board.analog_write(DIGITAL_PIN, i)
-            await asyncio.sleep(.005)
+            await asyncio.sleep(.005 * FADE_STEP)
+        # and finish fully off
+        await the_board.analog_write(DIGITAL_PIN, 0)
     except KeyboardInterrupt:
         the_board.shutdown()
         sys.exit(0)
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await fade(board, DIGITAL_PIN)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
+
 
-try:
-    # start the main function
-    loop.run_until_complete(fade(board, DIGITAL_PIN))
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
@@ -16,10 +16,10 @@
 """
 
 import asyncio
-import sys
-import time
 from telemetrix_aio import telemetrix_aio
 
+from _util import buffered_print, fmt_ts, run, wait_for_ctrl_c
+
 """
 This program continuously monitors an HC-SR04 Ultrasonic Sensor
 It reports changes to the distance sensed.
@@ -40,8 +40,9 @@ async def the_callback(data):
     The callback function to display the change in distance
     :param data: [report_type = PrivateConstants.SONAR_DISTANCE, trigger pin number, distance, timestamp]
     """
-    date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[3]))
-    print(f'Sonar Report: Trigger Pin: {data[1]} Distance: {data[2]} Time: {date}')
+    date = fmt_ts(data[3])
+    buffered_print(f'Sonar Report: Trigger Pin: {data[1]} Distance: {data[2]} '
+                   f'Time: {date}')
 
 
 async def sonar(my_board, trigger_pin, echo_pin, callback):
@@ -57,25 +58,22 @@ async def sonar(my_board, trigger_pin, echo_pin, callback):
 
     # set the pin mode for the trigger and echo pins
     await my_board.set_pin_mode_sonar(trigger_pin, echo_pin, callback)
-    # wait forever
-    while True:
-        try:
-            await asyncio.sleep(.01)
-        except KeyboardInterrupt:
-            await my_board.shutdown()
-            sys.exit(0)
-
-
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
-
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
-
-try:
-    # start the main function
-    loop.run_until_complete(sonar(board, TRIGGER_PIN, ECHO_PIN, the_callback))
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+    # wait for a Control-C to end the program
+    await wait_for_ctrl_c(my_board)
+
+
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await sonar(board, TRIGGER_PIN, ECHO_PIN, the_callback)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
+
+
+if __name__ == '__main__':
+    run(main)
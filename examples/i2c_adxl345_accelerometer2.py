@@ -19,6 +19,8 @@ import asyncio
 import sys
 from telemetrix_aio import telemetrix_aio
 
+from _util import run
+
 """
 This example sets up and control an ADXL345 i2c accelerometer.
 It will continuously print data the raw xyz data from the device.
@@ -53,26 +55,32 @@ async def adxl345(my_board):
     await asyncio.sleep(.1)
 
     # read_count = 20
+    # look up the read method once, outside the loop
+    i2c_read = my_board.i2c_read
     while True:
         # read 6 bytes from the data register
         try:
-            await my_board.i2c_read(83, 50, 6, the_callback, i2c_port=1)
-            await asyncio.sleep(.1)
+            # overlap the read request with the pacing delay
+            await asyncio.gather(i2c_read(83, 50, 6, the_callback, i2c_port=1),
+                                 asyncio.sleep(.1))
 
         except (KeyboardInterrupt, RuntimeError):
             await my_board.shutdown()
             sys.exit(0)
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await adxl345(board)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
+
 
-try:
-    # start the main function
-    loop.run_until_complete(adxl345(board))
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
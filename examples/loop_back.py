@@ -19,6 +19,8 @@ import asyncio
 import sys
 from telemetrix_aio import telemetrix_aio
 
+from _util import run
+
 """
 Loopback some data to assure that data can be sent and received between
 the Telemetrix client and arduino-telemetrix server.
@@ -44,24 +46,33 @@ async def loop_back(my_board, loop_back_data):
     """
     try:
         for data in loop_back_data:
-            await my_board.loop_back(data, callback=the_callback)
             print(f'Sending: {data}')
-            await asyncio.sleep(.1)
+        # send all the characters at once, and then give the
+        # looped back data time to arrive
+        await asyncio.gather(*(my_board.loop_back(data, callback=the_callback)
+                               for data in loop_back_data))
+        await asyncio.sleep(.1)
     except KeyboardInterrupt:
         my_board.shutdown()
         sys.exit(0)
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
 char_list = ['A', 'B', 'Z']
-try:
-    # start the main function
-    loop.run_until_complete(loop_back(board, char_list))
-    loop.run_until_complete(board.shutdown())
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+
+
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await loop_back(board, char_list)
+        await board.shutdown()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
+
+
+if __name__ == '__main__':
+    run(main)
@@ -21,9 +21,12 @@ DS18B20 or DS1822 temperature sensor.
 """
 
 import asyncio
+import struct
 import sys
 from telemetrix_aio import telemetrix_aio
 
+from _util import run
+
 
 # noinspection PyArgumentList
 class OneWireTemp:
@@ -31,6 +34,9 @@ class OneWireTemp:
     This class implements reading the sensor
     """
 
+    # a dictionary to determine the device type
+    chip_types = {0x10: 'DS18S20', 0x28: 'DS18B20', 0x22: 'DS1822'}
+
     def __init__(self, my_board, pin):
         """
 
@@ -39,24 +45,21 @@ class OneWireTemp:
         self.pin = pin
         self.board = my_board
 
-        # a dictionary to determine the device type
-        self.chip_types = {0x10: 'DS18S20', 0x28: 'DS18B20', 0x22: 'DS1822'}
-
-        # callback distributor map
-        # use the callback type to call the appropriate processing method
-        self.callback_distribution = {31: self.search_cb, 32: self.crc_cb,
-                                      25: self.reset_cb,
-                                      29: self.read_cb}
-
         # a list to hold the detected device address
         self.address = []
 
-        # a list to hold the measured temperature returned from device
-        self.temperature_data = []
+        # a buffer to hold the 9 scratch pad bytes returned from device
+        self.temperature_data = bytearray(9)
+
+        # number of scratch pad bytes received so far
+        self.temperature_index = 0
 
         # crc calculation result
         self.crc_comparator = None
 
+        # set by read_cb when all 9 scratch pad bytes have been received
+        self.scratchpad_ready = asyncio.Event()
+
         # run the program
         # loop.run_until_complete(self.run_it())
 
@@ -79,7 +82,7 @@ class OneWireTemp:
 
         # check crc of the address
         # the callback does the actual compare
-        await self.board.onewire_crc8(list(self.address), self.onewire_callback)
+        await self.board.onewire_crc8(self.address, self.onewire_callback)
         await asyncio.sleep(.3)
 
         # identify and print the chip type based on the address
@@ -113,19 +116,27 @@ class OneWireTemp:
                 # read the data from the scratch pad
                 await self.board.onewire_write(0xBE)
 
-                for x in range(10):
+                self.scratchpad_ready.clear()
+                for x in range(9):
                     await self.board.onewire_read(self.onewire_callback)
 
-                await asyncio.sleep(.3)
+                # wait for read_cb to receive all 9 scratch pad bytes
+                try:
+                    await asyncio.wait_for(self.scratchpad_ready.wait(), .5)
+                except asyncio.TimeoutError:
+                    print('Timed out reading the scratch pad\n')
+                    self.temperature_index = 0
+                    continue
 
                 # the temperature is contained in the first two bytes of the data
-                raw = (self.temperature_data[1] << 8) | self.temperature_data[0]
+                # as a signed, little endian value
+                raw = struct.unpack_from('<h', self.temperature_data)[0]
                 celsius = raw / 16.0
-                print("Celsius = {:0.2f}º C.".format(celsius))
+                print(f"Celsius = {celsius:0.2f}º C.")
                 fahrenheit = celsius * 1.8 + 32.0
-                print("Fahrenheit = {:0.2f}º F.".format(fahrenheit))
+                print(f"Fahrenheit = {fahrenheit:0.2f}º F.")
                 # clear out the buffer for the next read
-                self.temperature_data = []
+                self.temperature_index = 0
                 print()
             except KeyboardInterrupt:
                 await self.board.shutdown()
@@ -140,10 +151,17 @@ class OneWireTemp:
 
         # print(report)
 
-        if report[1] not in self.callback_distribution:
-            return  # ignore unknown types
-        else:
-            await self.callback_distribution[report[1]](report)
+        # read reports arrive most often, so they are tested first
+        subtype = report[1]
+        if subtype == 29:
+            await self.read_cb(report)
+        elif subtype == 31:
+            await self.search_cb(report)
+        elif subtype == 32:
+            await self.crc_cb(report)
+        elif subtype == 25:
+            await self.reset_cb(report)
+        # ignore unknown types
 
     async def search_cb(self, report):
         """
@@ -152,11 +170,8 @@ class OneWireTemp:
         :param report: [ReportType = 14, Report Subtype = 31, 8 bytes of device address,
                         timestamp]
         """
-        self.address = [report[x] for x in range(2, 10)]
-        print('Device Address = ', " ", end="")
-        for data in self.address:
-            print(hex(data), " ", end="")
-        print()
+        self.address = report[2:10]
+        print(f"Device Address =  {' '.join(hex(data) for data in self.address)}")
         self.crc_comparator = report[9]
 
     async def crc_cb(self, report):
@@ -184,20 +199,26 @@ class OneWireTemp:
     async def read_cb(self, report):
         """
         Byte read callback handler
-        Append each byte received to the temperature data list
+        Store each byte received in the temperature data buffer
         When 9 bytes are received, check the data's CRC.
 
         :param report: [ReportType = 14, Report Subtype = 29, 9 temperature bytes,
                         timestamp]
 
         """
-        self.temperature_data.append(report[2])
-        if len(self.temperature_data) == 9:
+        if self.temperature_index == len(self.temperature_data):
+            # a late byte from a read that has already completed
+            # or timed out - there is no room for it
+            return
+        self.temperature_data[self.temperature_index] = report[2]
+        self.temperature_index += 1
+        if self.temperature_index == 9:
             await self.board.onewire_crc8(self.temperature_data,
                                           callback=self.onewire_callback)
             # hex_list = [hex(x) for x in self.temperature_data]
             # print(hex_list)
-            self.crc_comparator = self.temperature_data[-1:][0]
+            self.crc_comparator = self.temperature_data[-1]
+            self.scratchpad_ready.set()
 
 
 async def onewire_example(the_board, data_pin):
@@ -211,25 +232,20 @@ async def onewire_example(the_board, data_pin):
 
     owt = OneWireTemp(the_board, data_pin)
     await owt.run_it()
-    # wait forever
-    while True:
-        try:
-            await asyncio.sleep(.01)
-        except KeyboardInterrupt:
-            await the_board.shutdown()
-            sys.exit(0)
 
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await onewire_example(board, 8)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
 
-try:
-    # start the main function
-    loop.run_until_complete(onewire_example(board, 8))
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
@@ -16,10 +16,11 @@
 """
 
 import asyncio
-import sys
 
 from telemetrix_aio import telemetrix_aio
 
+from _util import run
+
 """
 This example will set a servo to 0, 90 and 180 degree
 positions.
@@ -47,13 +48,20 @@ async def servo(my_board, pin):
     await my_board.servo_write(pin, 180)
     await my_board.servo_detach(pin)
 
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
 
-board = telemetrix_aio.TelemetrixAIO()
-try:
-    loop.run_until_complete(servo(board, 5))
-    loop.run_until_complete(board.shutdown())
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await servo(board, 5)
+        await board.shutdown()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
+
+
+if __name__ == '__main__':
+    run(main)
@@ -19,6 +19,8 @@ import asyncio
 import sys
 from telemetrix_aio import telemetrix_aio
 
+from _util import run
+
 
 """
 This program reads x, y, and z registers of an ADXL345 using 4 Wire SPI interface
@@ -87,25 +89,28 @@ async def adxl345(my_board):
     while True:
         # read 6 bytes from the data register
         try:
-            await my_board.spi_read_blocking(10, 50 | 0x40, 6, the_callback)
-
-            await asyncio.sleep(.5)
+            # overlap the read request with the pacing delay
+            await asyncio.gather(
+                my_board.spi_read_blocking(10, 50 | 0x40, 6, the_callback),
+                asyncio.sleep(.5))
 
         except (KeyboardInterrupt, RuntimeError):
             await my_board.shutdown()
             sys.exit(0)
 
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await adxl345(board)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
 
-try:
-    # start the main function
-    loop.run_until_complete(adxl345(board))
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
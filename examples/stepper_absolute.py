@@ -16,20 +16,25 @@
 
 """
 import asyncio
-import sys
-import time
 
 from telemetrix_aio import telemetrix_aio
 
+from _util import fmt_ts, run
+
 """
 Run a motor to an absolute position. Server will send a callback notification 
 when motion is complete.
 """
 
+# set by the completion callback when the motor reaches its target -
+# created in step_absolute() so that it belongs to the running loop
+motion_complete = None
+
 
 async def the_callback(data):
-    date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[2]))
+    date = fmt_ts(data[2])
     print(f'Motor {data[1]} absolute motion completed at: {date}.')
+    motion_complete.set()
 
 
 async def running_callback(data):
@@ -40,6 +45,8 @@ async def running_callback(data):
 
 
 async def step_absolute(the_board):
+    global motion_complete
+    motion_complete = asyncio.Event()
 
     # create an accelstepper instance for a TB6600 motor driver
     motor = await the_board.set_pin_mode_stepper(interface=1, pin1=8, pin2=9)
@@ -52,12 +59,10 @@ async def step_absolute(the_board):
     await the_board.stepper_is_running(motor, callback=running_callback)
     await asyncio.sleep(.2)
 
-    # set the max speed and acceleration
-    await the_board.stepper_set_max_speed(motor, 400)
-    await the_board.stepper_set_acceleration(motor, 800)
-
-    # set the absolute position in steps
-    await the_board.stepper_move_to(motor, -2000)
+    # set the max speed and acceleration, and the absolute position in steps
+    await asyncio.gather(the_board.stepper_set_max_speed(motor, 400),
+                         the_board.stepper_set_acceleration(motor, 800),
+                         the_board.stepper_move_to(motor, -2000))
 
     # run the motor
     print('Starting motor...')
@@ -66,26 +71,23 @@ async def step_absolute(the_board):
     await the_board.stepper_is_running(motor, callback=running_callback)
     await asyncio.sleep(.2)
 
-    # keep application running
-    while True:
-        try:
-            await asyncio.sleep(.2)
-
-        except KeyboardInterrupt:
-            await the_board.shutdown()
-            sys.exit(0)
-
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
-
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
-try:
-    # start the main function
-    loop.run_until_complete(step_absolute(board))
-    loop.run_until_complete(board.shutdown())
-
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+    # keep application running until the motion completes
+    await motion_complete.wait()
+
+
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await step_absolute(board)
+        await board.shutdown()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
+
+
+if __name__ == '__main__':
+    run(main)
@@ -17,11 +17,12 @@
 
 """
 import asyncio
-import time
-import sys
+import itertools
 
 from telemetrix_aio import telemetrix_aio
 
+from _util import run
+
 """
 Run a motor continuously without acceleration
 """
@@ -36,39 +37,38 @@ async def step_continuous(the_board):
     # motor = await the_board.set_pin_mode_stepper(interface=4, pin1=5, pin2=4, pin3=14,
     # pin4=12)
 
-    while True:
-        # set the max speed and speed
-        await the_board.stepper_set_max_speed(motor, 900)
-        await the_board.stepper_set_speed(motor, 200)
-        # run the motor
-        await the_board.stepper_run_speed(motor)
-        await asyncio.sleep(5)
+    # the max speed is the same in both directions - set it once
+    await the_board.stepper_set_max_speed(motor, 900)
 
-        await the_board.stepper_stop(motor)
-        await asyncio.sleep(2)
+    # look up the stepper methods once, outside the loop
+    set_speed = the_board.stepper_set_speed
+    run_speed = the_board.stepper_run_speed
+    stop = the_board.stepper_stop
 
-        # change direction
-        await the_board.stepper_set_max_speed(motor, 900)
-        await the_board.stepper_set_speed(motor, -200)
+    # alternate between forward and reverse
+    for speed in itertools.cycle((200, -200)):
+        await set_speed(motor, speed)
         # run the motor
-        await the_board.stepper_run_speed(motor)
+        await run_speed(motor)
         await asyncio.sleep(5)
 
-        await the_board.stepper_stop(motor)
+        await stop(motor)
         await asyncio.sleep(2)
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO()
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await step_continuous(board)
+        await board.shutdown()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
 
-try:
-    # start the main function
-    loop.run_until_complete(step_continuous(board))
-    loop.run_until_complete(board.shutdown())
 
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
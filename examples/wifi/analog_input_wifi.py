@@ -16,11 +16,15 @@
 """
 
 import asyncio
+import os
 import sys
-import time
 
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import buffered_print, fmt_ts, run, wait_for_ctrl_c
+
 """
 This file demonstrates analog input using both callbacks and
 polling. Time stamps are provided in both "cooked" and raw form
@@ -43,10 +47,10 @@ async def the_callback(data):
     :param data: [pin_mode, pin, current_reported_value,  timestamp]
     """
 
-    formatted_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[CB_TIME]))
-    print(f'Analog Call Input Callback: pin={data[CB_PIN]}, '
-          f'Value={data[CB_VALUE]} Time={formatted_time} '
-          f'(Raw Time={data[CB_TIME]})')
+    formatted_time = fmt_ts(data[CB_TIME])
+    buffered_print(f'Analog Call Input Callback: pin={data[CB_PIN]}, '
+                   f'Value={data[CB_VALUE]} Time={formatted_time} '
+                   f'(Raw Time={data[CB_TIME]})')
 
 
 async def analog_in(my_board, pin):
@@ -69,28 +73,23 @@ async def analog_in(my_board, pin):
     """
     await my_board.set_pin_mode_analog_input(pin, 5, the_callback)
 
-    # run forever waiting for input changes
-    try:
-        while True:
-            await asyncio.sleep(.001)
-
-    except KeyboardInterrupt:
-        await my_board.shutdown()
-        sys.exit(0)
+    # wait for a Control-C to end the program
+    await wait_for_ctrl_c(my_board)
 
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220')
+    try:
+        # start the main function
+        await analog_in(board, ANALOG_PIN)
+    except (KeyboardInterrupt, RuntimeError, asyncio.CancelledError):
+        await board.shutdown()
 
-try:
-    # start the main function
-    loop.run_until_complete(analog_in(board, ANALOG_PIN))
-    loop.run_until_complete(board.shutdown())
 
-except (KeyboardInterrupt, RuntimeError) as e:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
@@ -15,10 +15,15 @@
  Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 """
 import asyncio
+import os
 import sys
 
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import run
+
 """
 Setup a pin for digital output and output a signal
 and toggle the pin. Do this 4 times.
@@ -40,27 +45,30 @@ async def blink(my_board, pin):
     await my_board.set_pin_mode_digital_output(pin)
 
     # toggle the pin 4 times and exit
+    # each write is sent while its one second hold time runs
     for x in range(4):
         print('ON')
-        await my_board.digital_write(pin, 0)
-        await asyncio.sleep(1)
+        await asyncio.gather(my_board.digital_write(pin, 0),
+                             asyncio.sleep(1))
         print('OFF')
-        await my_board.digital_write(pin, 1)
-        await asyncio.sleep(1)
+        await asyncio.gather(my_board.digital_write(pin, 1),
+                             asyncio.sleep(1))
 
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.168',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.168')
+    try:
+        # start the main function
+        await blink(board, DIGITAL_PIN)
+        await board.shutdown()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
 
-try:
-    # start the main function
-    loop.run_until_complete(blink(board, DIGITAL_PIN))
-    loop.run_until_complete(board.shutdown())
 
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
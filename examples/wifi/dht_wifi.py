@@ -15,11 +15,15 @@
  Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 """
 
-import sys
-import time
 import asyncio
+import os
+import sys
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import buffered_print, fmt_ts, run, wait_for_ctrl_c
+
 """
 This program monitors a DHT 22 sensor. 
 """
@@ -37,6 +41,7 @@ TIME = 4
 # PIN = 1
 # ERROR_VALUE = 2
 
+
 # A callback function to display the distance
 async def the_callback(data):
     """
@@ -47,13 +52,14 @@ async def the_callback(data):
     """
     if data[1]:
         # error message
-        date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[4]))
-        print(f'DHT Error Report:'
-              f'Pin: {data[2]} Error: {data[3]}  Time: {date}')
+        date = fmt_ts(data[4])
+        buffered_print(f'DHT Error Report:'
+                       f'Pin: {data[2]} Error: {data[3]}  Time: {date}')
     else:
-        date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[5]))
-        print(f'DHT Valid Data Report:'
-              f'Pin: {data[2]} Humidity: {data[3]} Temperature: {data[4]} Time: {date}')
+        date = fmt_ts(data[5])
+        buffered_print(f'DHT Valid Data Report:'
+                       f'Pin: {data[2]} Humidity: {data[3]} '
+                       f'Temperature: {data[4]} Time: {date}')
 
 
 async def dht(my_board, pin, callback):
@@ -68,25 +74,23 @@ async def dht(my_board, pin, callback):
 
     # set the pin mode for the trigger and echo pins
     await my_board.set_pin_mode_dht(pin, callback)
-    # wait forever
-    while True:
-        try:
-            await asyncio.sleep(.01)
-        except KeyboardInterrupt:
-            await my_board.shutdown()
-            sys.exit(0)
-
-
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
-
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220')
-
-try:
-    # start the main function
-    loop.run_until_complete(dht(board, 5, the_callback))
-except (KeyboardInterrupt, RuntimeError) as e:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+    # wait for a Control-C to end the program
+    await wait_for_ctrl_c(my_board)
+
+
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await dht(board, 5, the_callback)
+    except (KeyboardInterrupt, RuntimeError, asyncio.CancelledError):
+        await board.shutdown()
+
+
+if __name__ == '__main__':
+    run(main)
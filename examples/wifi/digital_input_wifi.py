@@ -19,11 +19,15 @@
 """
 
 import asyncio
+import os
 import sys
-import time
 
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import buffered_print, fmt_ts, run, wait_for_ctrl_c
+
 """
 Monitor a digital input pin
 """
@@ -50,8 +54,9 @@ async def the_callback(data):
 
     :param data: [pin_mode, pin, current reported value, timestamp]
     """
-    date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[CB_TIME]))
-    print(f'Pin: {data[CB_PIN]} Value: {data[CB_VALUE]} Time Stamp: {date}')
+    date = fmt_ts(data[CB_TIME])
+    buffered_print(f'Pin: {data[CB_PIN]} Value: {data[CB_VALUE]} '
+                   f'Time Stamp: {date}')
 
 
 async def digital_in(my_board, pin):
@@ -77,23 +82,23 @@ async def digital_in(my_board, pin):
     # await my_board.enable_digital_reporting(pin)
     # await asyncio.sleep(1)
 
-    while True:
-        try:
-            await asyncio.sleep(.001)
-        except KeyboardInterrupt:
-            await board.shutdown()
-            sys.exit(0)
-
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
-
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220')
-
-try:
-    # start the main function
-    loop.run_until_complete(digital_in(board, DIGITAL_PIN))
-except (KeyboardInterrupt, RuntimeError) as e:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+    # wait for a Control-C to end the program
+    await wait_for_ctrl_c(my_board)
+
+
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await digital_in(board, DIGITAL_PIN)
+    except (KeyboardInterrupt, RuntimeError, asyncio.CancelledError):
+        await board.shutdown()
+
+
+if __name__ == '__main__':
+    run(main)
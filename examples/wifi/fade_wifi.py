@@ -18,12 +18,16 @@
  Based on the DHTNew library - https://github.com/RobTillaart/DHTNew
 """
 
-import sys
-import time
 import asyncio
+import os
+import sys
 
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import run
+
 """
 Setup a pin for output and fade its intensity
 """
@@ -55,18 +59,21 @@ async def fade(the_board, pin):
         the_board.shutdown()
         sys.exit(0)
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220')
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await fade(board, DIGITAL_PIN)
+        await board.shutdown()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
 
-try:
-    # start the main function
-    loop.run_until_complete(fade(board, DIGITAL_PIN))
-    loop.run_until_complete(board.shutdown())
 
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
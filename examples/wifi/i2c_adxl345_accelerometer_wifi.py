@@ -16,14 +16,22 @@
 """
 
 import asyncio
+import os
 import sys
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import buffered_print, run
+
 """
 This example sets up and control an ADXL345 i2c accelerometer.
 It will continuously print data the raw xyz data from the device.
 """
 
+# [register, value] writes that set up the device
+ADXL345_INIT = (bytes([45, 0]), bytes([45, 8]), bytes([49, 8]), bytes([49, 3]))
+
 
 # the call back function to print the adxl345 data
 async def the_callback(data):
@@ -32,7 +40,7 @@ async def the_callback(data):
     :param data: [pin_type, Device address, device read register, x data pair, y data pair, z data pair]
     :return:
     """
-    print(data)
+    buffered_print(str(data))
 
 
 async def adxl345(my_board):
@@ -40,40 +48,42 @@ async def adxl345(my_board):
     # device address = 83
     await my_board.set_pin_mode_i2c()
 
-    # set up power and control register
-    await my_board.i2c_write(83, [45, 0])
-    await asyncio.sleep(.1)
-    await my_board.i2c_write(83, [45, 8])
-    await asyncio.sleep(.1)
+    # set up the power and control register (45),
+    # then the data format register (49)
+    for init_write in ADXL345_INIT:
+        await my_board.i2c_write(83, init_write)
 
-    # set up the data format register
-    await my_board.i2c_write(83, [49, 8])
-    await asyncio.sleep(.1)
-    await my_board.i2c_write(83, [49, 3])
-    await asyncio.sleep(.1)
+    # give the device time to settle before reading
+    await asyncio.sleep(.05)
 
     # read_count = 20
+    # look up the read method once, outside the loop
+    i2c_read = my_board.i2c_read
     while True:
         # read 6 bytes from the data register
         try:
-            await my_board.i2c_read(83, 50, 6, the_callback)
-            await asyncio.sleep(.1)
+            # overlap the read request with the pacing delay
+            await asyncio.gather(i2c_read(83, 50, 6, the_callback),
+                                 asyncio.sleep(.1))
 
         except (KeyboardInterrupt, RuntimeError):
             await my_board.shutdown()
             sys.exit(0)
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220')
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await adxl345(board)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
 
-try:
-    # start the main function
-    loop.run_until_complete(adxl345(board))
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
 
+if __name__ == '__main__':
+    run(main)
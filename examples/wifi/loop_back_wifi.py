@@ -16,9 +16,14 @@
 """
 
 import asyncio
+import os
 import sys
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import run
+
 """
 Loopback some data to assure that data can be sent and received between
 the Telemetrix client and arduino-telemetrix server.
@@ -51,18 +56,24 @@ async def loop_back(my_board, loop_back_data):
         my_board.shutdown()
         sys.exit(0)
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220')
 char_list = ['A', 'B', 'Z']
-try:
-    # start the main function
-    loop.run_until_complete(loop_back(board, char_list))
-    loop.run_until_complete(board.shutdown())
-
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+
+
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await loop_back(board, char_list)
+        await board.shutdown()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
+
+
+if __name__ == '__main__':
+    run(main)
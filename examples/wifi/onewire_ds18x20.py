@@ -21,9 +21,14 @@ DS18B20 or DS1822 temperature sensor.
 """
 
 import asyncio
+import os
 import sys
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import run
+
 
 # noinspection PyArgumentList
 class OneWireTemp:
@@ -211,25 +216,21 @@ async def onewire_example(the_board, data_pin):
 
     owt = OneWireTemp(the_board, data_pin)
     await owt.run_it()
-    # wait forever
-    while True:
-        try:
-            await asyncio.sleep(.01)
-        except KeyboardInterrupt:
-            await the_board.shutdown()
-            sys.exit(0)
 
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.112',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await onewire_example(board, 1)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.112')
 
-try:
-    # start the main function
-    loop.run_until_complete(onewire_example(board, 1))
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
@@ -16,10 +16,15 @@
 """
 
 import asyncio
+import os
 import sys
 
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import run
+
 """
 This example will set a servo to 0, 90 and 180 degree
 positions.
@@ -47,14 +52,21 @@ async def servo(my_board, pin):
     await my_board.servo_write(pin, 180)
     await my_board.servo_detach(4)
 
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
 
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220')
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await servo(board, 4)
+        await board.shutdown()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
+
 
-try:
-    loop.run_until_complete(servo(board, 4))
-    loop.run_until_complete(board.shutdown())
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
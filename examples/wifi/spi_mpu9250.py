@@ -25,11 +25,16 @@ the callback functions.
 """
 
 import asyncio
+import os
+import struct
 import sys
-import time
 
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import buffered_print, run
+
 # Instantiate the TelemetrixRpiPico class accepting all default parameters.
 # board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.112')
 
@@ -51,6 +56,13 @@ CS_PIN = 5
 # CS = GPIO5             NCS
 NUM_BYTES_TO_READ = 6
 
+# a burst read from ACCEL_XOUT_H returns seven signed big-endian values:
+# AX, AY, AZ, TEMP, GX, GY, GZ
+MPU_SAMPLE = struct.Struct('>7h')
+
+# clear PWR_MGMT_1 (0x6B) to reset the device to its default state
+MPU_RESET = bytes([0x6B, 0])
+
 """
  CALLBACKS
  
@@ -64,44 +76,35 @@ async def the_device_callback(report):
     :param report: [SPI_REPORT, read register, Number of bytes, device_id]
     """
     if report[3] == 0x71:
-        print('MPU9250 Device ID confirmed.')
+        buffered_print('MPU9250 Device ID confirmed.')
     else:
-        print(f'Unexpected device ID: {report[3]}')
+        buffered_print(f'Unexpected device ID: {report[3]}')
 
 
 # noinspection GrazieInspection
-async def accel_callback(report):
+async def accel_gyro_callback(report):
     """
-    Print the AX, AY and AZ values.
-    :param report: [SPI_REPORT, Register, Number of bytes, AX-msb, AX-lsb
-    AY-msb, AY-lsb, AX-msb, AX-lsb]
-    """
-    print(f"AX = {int.from_bytes(report[3:5], byteorder='big', signed=True)}  "
-          f"AY = {int.from_bytes(report[5:7], byteorder='big', signed=True)}  "
-          f"AZ = {int.from_bytes(report[7:9], byteorder='big', signed=True)}  ")
-
+    Print the AX, AY, AZ and GX, GY, GZ values read in a single burst
+    starting at the ACCEL_XOUT_H register.
 
-async def gyro_callback(report):
-    # noinspection GrazieInspection
+    :param report: [SPI_REPORT, Register, Number of bytes, AX-msb, AX-lsb,
+    AY-msb, AY-lsb, AZ-msb, AZ-lsb, TEMP-msb, TEMP-lsb, GX-msb, GX-lsb,
+    GY-msb, GY-lsb, GZ-msb, GZ-lsb]
     """
-        Print the GX, GY, and GZ values.
-
-        :param report: [SPI_REPORT, Register, Number of bytes, GX-msb, GX-lsb
-        GY-msb, GY-lsb, GX-msb, GX-lsb]
-        """
+    ax, ay, az, _temp, gx, gy, gz = MPU_SAMPLE.unpack(bytes(report[3:17]))
 
-    print(f"GX = {int.from_bytes(report[3:5], byteorder='big', signed=True)}  "
-          f"GY = {int.from_bytes(report[5:7], byteorder='big', signed=True)}  "
-          f"GZ = {int.from_bytes(report[7:9], byteorder='big', signed=True)}  ")
+    buffered_print(f"AX = {ax}  AY = {ay}  AZ = {az}  \n"
+                   f"GX = {gx}  GY = {gy}  GZ = {gz}  ")
 
 
 # This is a utility function to read SPI data
-async def read_data_from_device(register, number_of_bytes, callback):
+async def read_data_from_device(my_board, register, number_of_bytes, callback):
     # noinspection GrazieInspection
     """
     This function reads the number of bytes using the register value.
     Data is returned via the specified callback.fg
 
+    :param my_board: telemetrix_aio instance
     :param register: register value
     :param number_of_bytes: number of bytes to read
     :param callback: callback function
@@ -110,54 +113,57 @@ async def read_data_from_device(register, number_of_bytes, callback):
     data = register
 
     # activate chip select
-    await board.spi_cs_control(CS_PIN, 0)
+    await my_board.spi_cs_control(CS_PIN, 0)
 
-    await board.spi_read_blocking(data, number_of_bytes, call_back=callback)
+    await my_board.spi_read_blocking(CS_PIN, data, number_of_bytes,
+                                     call_back=callback)
 
     # deactivate chip select
-    await board.spi_cs_control(CS_PIN, 1)
-    time.sleep(.1)
+    await my_board.spi_cs_control(CS_PIN, 1)
+    await asyncio.sleep(.1)
 
 
 async def spi_example(the_board):
 
     # initialize the device
-    await board.set_pin_mode_spi(CS)
+    await the_board.set_pin_mode_spi(CS)
 
     # reset the device
     await the_board.spi_cs_control(CS_PIN, 0)
-    await the_board.spi_write_blocking([0x6B, 0])
+    await the_board.spi_write_blocking(CS_PIN, MPU_RESET)
     await the_board.spi_cs_control(CS_PIN, 1)
 
     await asyncio.sleep(.1)
 
     # get the device ID
-    await read_data_from_device(0x75, 1, the_device_callback)
+    await read_data_from_device(the_board, 0x75, 1, the_device_callback)
 
     while True:
         try:
-            await asyncio.sleep(1)
-            # get the acceleration values
-            await read_data_from_device(0x3b, 6, accel_callback)
-            await asyncio.sleep(.1)
-
-            # get the gyro values
-            await read_data_from_device(0x43, 6, gyro_callback)
-            await asyncio.sleep(.1)
+            # get the acceleration, temperature and gyro values -
+            # the registers are contiguous, so one 14 byte read covers them.
+            # The read overlaps the one second pacing delay.
+            await asyncio.gather(
+                read_data_from_device(the_board, 0x3b, 14, accel_gyro_callback),
+                asyncio.sleep(1))
         except KeyboardInterrupt:
             await the_board.shutdown()
             sys.exit(0)
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220')
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.220',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await spi_example(board)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
+
 
-try:
-    # start the main function
-    loop.run_until_complete(spi_example(board))
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+if __name__ == '__main__':
+    run(main)
@@ -18,11 +18,15 @@
  Based on the DHTNew library - https://github.com/RobTillaart/DHTNew
 """
 import asyncio
-import time
+import os
 import sys
 
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import run, wait_for_ctrl_c
+
 """
 Run a motor continuously without acceleration
 """
@@ -43,26 +47,23 @@ async def step_continuous(the_board):
     # run the motor
     await the_board.stepper_run_speed(motor)
 
-    # keep application running
-    while True:
-        try:
-            await asyncio.sleep(.0002)
-        except KeyboardInterrupt:
-            await the_board.shutdown()
-            sys.exit(0)
-
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
-
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.112')
-
-try:
-    # start the main function
-    loop.run_until_complete(step_continuous(board))
-    loop.run_until_complete(board.shutdown())
-
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
+    # keep application running until Control-C
+    await wait_for_ctrl_c(the_board)
+
+
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.112',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
+
+    try:
+        # start the main function
+        await step_continuous(board)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
+
+
+if __name__ == '__main__':
+    run(main)
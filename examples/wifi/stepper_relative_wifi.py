@@ -16,22 +16,34 @@
 
 """
 import asyncio
+import os
 import sys
-import time
 
 from telemetrix_aio import telemetrix_aio
 
+# the helpers shared by the examples are in the parent directory
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from _util import fmt_ts, run
+
 """
 Run a motor to a relative position.
 """
 
+# set by the completion callback when the motor reaches its target -
+# created in step_relative() so that it belongs to the running loop
+motion_complete = None
+
 
 async def the_callback(data):
-    date = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(data[2]))
+    date = fmt_ts(data[2])
     print(f'Motor {data[1]} relative  motion completed at: {date}.')
+    motion_complete.set()
 
 
 async def step_relative(the_board):
+    global motion_complete
+    motion_complete = asyncio.Event()
+
     # create an accelstepper instance for a TB6600 motor driver
     motor = await the_board.set_pin_mode_stepper(interface=1, pin1=5, pin2=4)
 
@@ -50,27 +62,24 @@ async def step_relative(the_board):
     # run the motor
     await the_board.stepper_run(motor, completion_callback=the_callback)
 
-    # keep application running
-    while True:
-        try:
-            await asyncio.sleep(.2)
-        except KeyboardInterrupt:
-            await board.shutdown()
-            sys.exit(0)
+    # keep application running until the motion completes
+    await motion_complete.wait()
 
-# get the event loop
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
 
-# instantiate telemetrix_aio
-board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.112')
+async def main():
+    # instantiate telemetrix_aio
+    board = telemetrix_aio.TelemetrixAIO(ip_address='192.168.2.112',
+                                         autostart=False,
+                                         close_loop_on_shutdown=False)
+    await board.start_aio()
 
-try:
-    # start the main function
-    loop.run_until_complete(step_relative(board))
-    loop.run_until_complete(board.shutdown())
+    try:
+        # start the main function
+        await step_relative(board)
+        await board.shutdown()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        await board.shutdown()
 
-except KeyboardInterrupt:
-    loop.run_until_complete(board.shutdown())
-    sys.exit(0)
 
+if __name__ == '__main__':
+    run(main)
@@ -129,6 +129,10 @@ class PrivateConstants:
     # maximum number of analog pins supported
     NUMBER_OF_ANALOG_PINS = 20
 
+    # pin numbers are sent as a single byte - this sizes the
+    # per pin callback tables
+    MAX_PINS = 256
+
     # maximum number of sonars allowed
     MAX_SONARS = 6
 
@@ -16,15 +16,17 @@
 """
 
 import asyncio
+import collections
+import contextlib
+import functools
+import logging
 # import socket
-# import struct
+import struct
 import sys
 import time
 
 # noinspection PyPackageRequirementscd
 from serial.serialutil import SerialException
-# noinspection PyPackageRequirements
-from serial.tools import list_ports
 
 # noinspection PyUnresolvedReferences
 from telemetrix_aio.private_constants import PrivateConstants
@@ -33,6 +35,98 @@ from telemetrix_aio.telemetrix_aio_socket import TelemetrixAioSocket
 # noinspection PyUnresolvedReferences
 from telemetrix_aio.telemtrix_aio_serial import TelemetrixAioSerial
 
+_LOG = logging.getLogger(__name__)
+
+# check to make sure that Python interpreter is version 3.8.3 or greater
+if sys.version_info < (3, 8, 3):
+    raise RuntimeError("ERROR: Python 3.8.3 or greater is "
+                       "required for use of this program.")
+
+# precompiled encoders for fixed-shape commands
+# command id, pin, 16 bit value
+_ANALOG_WRITE = struct.Struct('>BBH')
+# command id, pin, value
+_DIGITAL_WRITE = struct.Struct('>BBB')
+# command id, pin, 16 bit min pulse, 16 bit max pulse
+_SERVO_ATTACH = struct.Struct('>BBHH')
+# command id, pin, angle
+_SERVO_WRITE = struct.Struct('>BBB')
+# command id, address, register, number of bytes, stop transmission,
+# i2c port, write register
+_I2C_READ = struct.Struct('>BBBB?BB')
+# i2c write encoders, keyed by the number of data bytes - built on first use
+_I2C_WRITE = {}
+# command id, pin, pin mode, 16 bit differential, enable reporting
+_SET_PIN_MODE_ANALOG = struct.Struct('>BBBHB')
+# command id, motor id, 32 bit signed position, polarity
+_STEPPER_POSITION = struct.Struct('>BBlB')
+# command id, motor id, 32 bit signed position
+_STEPPER_SET_POSITION = struct.Struct('>BBl')
+# command id, motor id, 16 bit signed speed, polarity
+_STEPPER_SPEED = struct.Struct('>BBhB')
+# command id, motor id, 16 bit value
+_STEPPER_U16 = struct.Struct('>BBH')
+
+# report field decoders - 16 bit unsigned and 32 bit signed values
+_U16BE = struct.Struct('>H')
+_I32BE = struct.Struct('>i')
+
+
+def _reporting_frames(subcommand):
+    """
+    Build the framed MODIFY_REPORTING commands for every pin number.
+
+    :param subcommand: one of the PrivateConstants.REPORTING_* values
+
+    :returns: tuple of framed commands, indexed by pin number
+    """
+    return tuple(bytes((3, PrivateConstants.MODIFY_REPORTING, subcommand, pin))
+                 for pin in range(PrivateConstants.MAX_PINS))
+
+
+# complete, length prefixed reporting control frames
+_DISABLE_ALL_REPORTING = bytes((3, PrivateConstants.MODIFY_REPORTING,
+                                PrivateConstants.REPORTING_DISABLE_ALL, 0))
+_DISABLE_ANALOG_REPORTING = _reporting_frames(PrivateConstants.REPORTING_ANALOG_DISABLE)
+_DISABLE_DIGITAL_REPORTING = _reporting_frames(PrivateConstants.REPORTING_DIGITAL_DISABLE)
+_ENABLE_ANALOG_REPORTING = _reporting_frames(PrivateConstants.REPORTING_ANALOG_ENABLE)
+_ENABLE_DIGITAL_REPORTING = _reporting_frames(PrivateConstants.REPORTING_DIGITAL_ENABLE)
+
+# outgoing frames shorter than this are built in pooled, preallocated buffers
+_FRAME_BUFFER_SIZE = 32
+# number of pooled frame buffers
+_FRAME_POOL_SIZE = 32
+
+# the report reader yields to the event loop once per this many reports
+_DISPATCH_YIELD_INTERVAL = 64
+
+# maximum number of reports read but not yet handled
+_REPORT_QUEUE_SIZE = 1024
+
+# complete, length prefixed ARE_U_THERE frame used to probe serial ports
+_ARE_U_THERE_PROBE = bytes((1, PrivateConstants.ARE_U_THERE))
+
+# _set_pin_mode command builders, indexed by pin mode.
+# Each builder is called with the pin number and the analog differential.
+_PIN_MODE_COMMANDS = {
+    PrivateConstants.AT_INPUT: lambda pin, differential: bytes(
+        (PrivateConstants.SET_PIN_MODE, pin, PrivateConstants.AT_INPUT, 1)),
+    PrivateConstants.AT_INPUT_PULLUP: lambda pin, differential: bytes(
+        (PrivateConstants.SET_PIN_MODE, pin, PrivateConstants.AT_INPUT_PULLUP, 1)),
+    PrivateConstants.AT_OUTPUT: lambda pin, differential: bytes(
+        (PrivateConstants.SET_PIN_MODE, pin, PrivateConstants.AT_OUTPUT, 1)),
+    PrivateConstants.AT_ANALOG: lambda pin, differential: _SET_PIN_MODE_ANALOG.pack(
+        PrivateConstants.SET_PIN_MODE, pin, PrivateConstants.AT_ANALOG,
+        differential, 1),
+}
+
+# name of the callback table a pin mode registers its callback in
+_PIN_MODE_CALLBACKS = {
+    PrivateConstants.AT_INPUT: 'digital_callbacks',
+    PrivateConstants.AT_INPUT_PULLUP: 'digital_callbacks',
+    PrivateConstants.AT_ANALOG: 'analog_callbacks',
+}
+
 
 # noinspection GrazieInspection,PyArgumentList,PyMethodMayBeStatic,PyRedundantParentheses
 class TelemetrixAIO:
@@ -46,10 +140,11 @@ class TelemetrixAIO:
     # noinspection PyPep8,PyPep8
     def __init__(self, com_port=None,
                  arduino_instance_id=1, arduino_wait=4,
-                 sleep_tune=0.0001, autostart=True,
+                 sleep_tune=0, autostart=True,
                  loop=None, shutdown_on_exception=True,
                  close_loop_on_shutdown=True,
-                 ip_address=None, ip_port=31335):
+                 ip_address=None, ip_port=31335,
+                 coalesce_writes=False, use_uvloop=False):
 
         """
         If you have a single Arduino connected to your computer,
@@ -64,10 +159,18 @@ class TelemetrixAIO:
         :param arduino_wait: Amount of time to wait for an Arduino to
                              fully reset itself.
 
-        :param sleep_tune: A tuning parameter (typically not changed by user)
+        :param sleep_tune: A tuning parameter (typically not changed by user).
+                           The time, in seconds, the report dispatcher
+                           sleeps after handling each report. With the
+                           default of 0, it does not sleep between
+                           reports.
 
         :param autostart: If you wish to call the start method within
                           your application, then set this to False.
+                          This must be False when TelemetrixAIO is
+                          instantiated from within a running event loop,
+                          for example inside a coroutine run with
+                          asyncio.run().
 
         :param loop: optional user provided event loop
 
@@ -79,17 +182,25 @@ class TelemetrixAIO:
                                        when a shutdown is called or a serial
                                        error occurs
 
-        """
-        # check to make sure that Python interpreter is version 3.8.3 or greater
-        python_version = sys.version_info
-        if python_version[0] >= 3:
-            if python_version[1] >= 8:
-                if python_version[2] >= 3:
-                    pass
-            else:
-                raise RuntimeError("ERROR: Python 3.7 or greater is "
-                                   "required for use of this program.")
+        :param ip_address: ip address of a tcp/ip connected device
+
+        :param ip_port: ip port of a tcp/ip connected device
+
+        :param coalesce_writes: If True, commands issued during the same pass
+                                of the event loop are collected and sent
+                                together in a single write. Call flush() if
+                                a command must be sent before continuing.
+                                To batch only some commands, use
+                                "async with board.batch():" instead.
 
+        :param use_uvloop: If True and no loop is passed in or running,
+                           the event loop is created with uvloop, when
+                           it is installed. uvloop lowers the cost of
+                           each wake up for the many small reads and
+                           writes of a serial or tcp/ip connection.
+                           It is not available on Windows.
+
+        """
         # save input parameters
         self.com_port = com_port
         self.arduino_instance_id = arduino_instance_id
@@ -104,23 +215,53 @@ class TelemetrixAIO:
 
         # set the event loop
         if loop is None:
-            self.loop = asyncio.get_event_loop()
+            try:
+                # use the running loop when created from within a coroutine
+                self.loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.loop = None
+                if use_uvloop:
+                    try:
+                        # noinspection PyPackageRequirements
+                        import uvloop
+                    except ImportError:
+                        _LOG.warning('uvloop is not installed - using the '
+                                     'default event loop')
+                    else:
+                        self.loop = uvloop.new_event_loop()
+                        asyncio.set_event_loop(self.loop)
+                if self.loop is None:
+                    self.loop = asyncio.get_event_loop()
         else:
             self.loop = loop
 
         self.shutdown_on_exception = shutdown_on_exception
         self.close_loop_on_shutdown = close_loop_on_shutdown
 
-        # dictionaries to store the callbacks for each pin
-        self.analog_callbacks = {}
+        # write coalescing - commands waiting to be sent and
+        # whether a flush has been scheduled for them
+        self.coalesce_writes = coalesce_writes
+        self._tx_buf = bytearray()
+        self._tx_scheduled = False
+        # the task running the scheduled flush
+        self._tx_flush_task = None
+        # nesting depth of batch() blocks
+        self._tx_batch_depth = 0
 
-        self.digital_callbacks = {}
+        # preallocated frame buffers reused by _send_command
+        self._cmd_pool = collections.deque(
+            (bytearray(_FRAME_BUFFER_SIZE) for _ in range(_FRAME_POOL_SIZE)),
+            maxlen=_FRAME_POOL_SIZE)
 
-        self.i2c_callback = None
-        self.i2c_callback2 = None
+        # lists to store the callbacks for each pin, indexed by pin number
+        self.analog_callbacks = [None] * PrivateConstants.MAX_PINS
 
-        self.i2c_1_active = False
-        self.i2c_2_active = False
+        self.digital_callbacks = [None] * PrivateConstants.MAX_PINS
+
+        # i2c read callbacks and activation flags, indexed by i2c port
+        self._i2c_callbacks = [None, None]
+
+        self._i2c_active = [False, False]
 
         self.spi_callback = None
 
@@ -129,93 +270,72 @@ class TelemetrixAIO:
         # debug loopback callback method
         self.loop_back_callback = None
 
-        # the trigger pin will be the key to retrieve
+        # the trigger pin will be the index to retrieve
         # the callback for a specific HC-SR04
-        self.sonar_callbacks = {}
+        self.sonar_callbacks = [None] * PrivateConstants.MAX_PINS
 
         self.sonar_count = 0
 
-        self.dht_callbacks = {}
+        # indexed by DHT pin number
+        self.dht_callbacks = [None] * PrivateConstants.MAX_PINS
 
         self.dht_count = 0
 
         # serial port in use
         self.serial_port = None
 
+        # the serial port or socket in use - both provide write() and
+        # readexactly()
+        self._transport = None
+
         # generic asyncio task holder
         self.the_task = None
 
+        # task that runs the report handlers
+        self._report_task = None
+
         # flag to indicate we are in shutdown mode
         self.shutdown_flag = False
 
-        self.report_dispatch = {}
-
         # reported features
         self.reported_features = 0
 
-        # To add a command to the command dispatch table, append here.
-        self.report_dispatch.update(
-            {PrivateConstants.LOOP_COMMAND: self._report_loop_data})
-        self.report_dispatch.update(
-            {PrivateConstants.DEBUG_PRINT: self._report_debug_data})
-        self.report_dispatch.update(
-            {PrivateConstants.DIGITAL_REPORT: self._digital_message})
-        self.report_dispatch.update(
-            {PrivateConstants.ANALOG_REPORT: self._analog_message})
-        self.report_dispatch.update(
-            {PrivateConstants.SERVO_UNAVAILABLE: self._servo_unavailable})
-        self.report_dispatch.update(
-            {PrivateConstants.I2C_READ_REPORT: self._i2c_read_report})
-        self.report_dispatch.update(
-            {PrivateConstants.I2C_TOO_FEW_BYTES_RCVD: self._i2c_too_few})
-        self.report_dispatch.update(
-            {PrivateConstants.I2C_TOO_MANY_BYTES_RCVD: self._i2c_too_many})
-        self.report_dispatch.update(
-            {PrivateConstants.SONAR_DISTANCE: self._sonar_distance_report})
-        self.report_dispatch.update({PrivateConstants.DHT_REPORT: self._dht_report})
-        self.report_dispatch.update(
-            {PrivateConstants.SPI_REPORT: self._spi_report})
-        self.report_dispatch.update(
-            {PrivateConstants.ONE_WIRE_REPORT: self._onewire_report})
-        self.report_dispatch.update(
-            {PrivateConstants.STEPPER_DISTANCE_TO_GO:
-                 self._stepper_distance_to_go_report})
-        self.report_dispatch.update(
-            {PrivateConstants.STEPPER_TARGET_POSITION:
-                 self._stepper_target_position_report})
-        self.report_dispatch.update(
-            {PrivateConstants.STEPPER_CURRENT_POSITION:
-                 self._stepper_current_position_report})
-        self.report_dispatch.update(
-            {PrivateConstants.STEPPER_RUNNING_REPORT:
-                 self._stepper_is_running_report})
-        self.report_dispatch.update(
-            {PrivateConstants.STEPPER_RUN_COMPLETE_REPORT:
-                 self._stepper_run_complete_report})
-        self.report_dispatch.update(
-            {PrivateConstants.STEPPER_DISTANCE_TO_GO:
-                 self._stepper_distance_to_go_report})
-        self.report_dispatch.update(
-            {PrivateConstants.STEPPER_TARGET_POSITION:
-                 self._stepper_target_position_report})
-        self.report_dispatch.update(
-            {PrivateConstants.FEATURES:
-                 self._features_report})
-
-        # dictionaries to store the callbacks for each pin
-        self.analog_callbacks = {}
-
-        self.digital_callbacks = {}
-
-        self.i2c_callback = None
-        self.i2c_callback2 = None
-
-        self.i2c_1_active = False
-        self.i2c_2_active = False
-
-        self.spi_callback = None
-
-        self.onewire_callback = None
+        # To add a command to the command dispatch table, add it here.
+        report_handlers = {
+            PrivateConstants.LOOP_COMMAND: self._report_loop_data,
+            PrivateConstants.DEBUG_PRINT: self._report_debug_data,
+            PrivateConstants.DIGITAL_REPORT: functools.partial(
+                self._digital_message, callbacks=self.digital_callbacks),
+            PrivateConstants.ANALOG_REPORT: functools.partial(
+                self._analog_message, callbacks=self.analog_callbacks),
+            PrivateConstants.SERVO_UNAVAILABLE: self._servo_unavailable,
+            PrivateConstants.I2C_READ_REPORT: self._i2c_read_report,
+            PrivateConstants.I2C_TOO_FEW_BYTES_RCVD: self._i2c_too_few,
+            PrivateConstants.I2C_TOO_MANY_BYTES_RCVD: self._i2c_too_many,
+            PrivateConstants.SONAR_DISTANCE: functools.partial(
+                self._sonar_distance_report, callbacks=self.sonar_callbacks),
+            PrivateConstants.DHT_REPORT: functools.partial(
+                self._dht_report, callbacks=self.dht_callbacks),
+            PrivateConstants.SPI_REPORT: self._spi_report,
+            PrivateConstants.ONE_WIRE_REPORT: self._onewire_report,
+            PrivateConstants.STEPPER_DISTANCE_TO_GO:
+                self._stepper_distance_to_go_report,
+            PrivateConstants.STEPPER_TARGET_POSITION:
+                self._stepper_target_position_report,
+            PrivateConstants.STEPPER_CURRENT_POSITION:
+                self._stepper_current_position_report,
+            PrivateConstants.STEPPER_RUNNING_REPORT: self._stepper_is_running_report,
+            PrivateConstants.STEPPER_RUN_COMPLETE_REPORT:
+                self._stepper_run_complete_report,
+            PrivateConstants.FEATURES: self._features_report,
+        }
+
+        # report handlers, indexed by report id - ids without a handler
+        # are ignored. The per pin handlers above are bound to their
+        # callback list, so they do not look it up for every report.
+        self.report_dispatch = tuple(report_handlers.get(report,
+                                                         self._report_unknown)
+                                     for report in range(256))
 
         self.cs_pins_enabled = []
 
@@ -225,14 +345,6 @@ class TelemetrixAIO:
         # flag to indicate if onewire is initialized
         self.onewire_enabled = False
 
-        # the trigger pin will be the key to retrieve
-        # the callback for a specific HC-SR04
-        self.sonar_callbacks = {}
-
-        self.sonar_count = 0
-
-        self.dht_callbacks = {}
-
         # stepper motor variables
 
         # updated when a new motor is added
@@ -263,10 +375,15 @@ class TelemetrixAIO:
         for motor in range(self.max_number_of_steppers):
             self.stepper_info_list.append(self.stepper_info.copy())
 
-        print(f'TelemetrixAIO Version: {PrivateConstants.TELEMETRIX_AIO_VERSION}')
-        print(f'Copyright (c) 2018-2023 Alan Yorinks All rights reserved.\n')
+        _LOG.info('TelemetrixAIO Version: %s',
+                  PrivateConstants.TELEMETRIX_AIO_VERSION)
+        _LOG.info('Copyright (c) 2018-2023 Alan Yorinks All rights reserved.')
 
         if autostart:
+            if self.loop.is_running():
+                raise RuntimeError('autostart must be False when TelemetrixAIO is '
+                                   'instantiated within a running event loop. '
+                                   'Call start_aio() instead.')
             self.loop.run_until_complete(self.start_aio())
 
     async def start_aio(self):
@@ -299,7 +416,7 @@ class TelemetrixAIO:
                         await self.shutdown()
 
             if self.com_port:
-                print(f'Telemetrix4AIO found and connected to {self.com_port}')
+                _LOG.info('Telemetrix4AIO found and connected to %s', self.com_port)
 
                 # no com_port found - raise a runtime exception
             else:
@@ -310,6 +427,7 @@ class TelemetrixAIO:
         else:
             self.sock = TelemetrixAioSocket(self.ip_address, self.ip_port, self.loop)
             await self.sock.start()
+            self._transport = self.sock
             # self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             # self.sock.connect((self.ip_address, self.ip_port))
             # print(f'Successfully connected to: {self.ip_address}:{self.ip_port}')
@@ -317,20 +435,20 @@ class TelemetrixAIO:
         # get arduino firmware version and print it
         firmware_version = await self._get_firmware_version()
         if not firmware_version:
-            print('*** Firmware Version retrieval timed out. ***')
-            print('\nDo you have Arduino connectivity and do you have the ')
-            print('Telemetrix4Arduino sketch uploaded to the board and are connected')
-            print('to the correct serial port.\n')
-            print('To see a list of serial ports, type: '
-                  '"list_serial_ports" in your console.')
+            _LOG.error('*** Firmware Version retrieval timed out. *** '
+                       'Do you have Arduino connectivity and do you have the '
+                       'Telemetrix4Arduino sketch uploaded to the board and are '
+                       'connected to the correct serial port? '
+                       'To see a list of serial ports, type: '
+                       '"list_serial_ports" in your console.')
             if self.shutdown_on_exception:
                 await self.shutdown()
             raise RuntimeError
         else:
             if firmware_version[2] < 5:
                 raise RuntimeError('Please upgrade the server firmware to version 5.0.0 or greater')
-            print(f'Telemetrix4Arduino Version Number: {firmware_version[2]}.'
-                  f'{firmware_version[3]}.{firmware_version[4]}')
+            _LOG.info('Telemetrix4Arduino Version Number: %d.%d.%d',
+                      *firmware_version[2:5])
             # start the command dispatcher loop
             command = [PrivateConstants.ENABLE_ALL_REPORTS]
             await self._send_command(command)
@@ -341,7 +459,9 @@ class TelemetrixAIO:
             # get the features list
             command = [PrivateConstants.GET_FEATURES]
             await self._send_command(command)
-            time.sleep(.5)
+            # let the dispatcher task run so that the features report
+            # is processed before start_aio returns
+            await asyncio.sleep(.5)
 
             # Have the server reset its data structures
             command = [PrivateConstants.RESET]
@@ -365,55 +485,82 @@ class TelemetrixAIO:
         This is used explicitly with the FirmataExpress sketch.
         """
 
+        # imported here, since port enumeration is only needed when no
+        # com_port or ip_address was specified
+        # noinspection PyPackageRequirements
+        from serial.tools import list_ports
+
         # a list of serial ports to be checked
         serial_ports = []
 
-        print('Opening all potential serial ports...')
+        _LOG.info('Opening all potential serial ports...')
         the_ports_list = list_ports.comports()
         for port in the_ports_list:
             if port.pid is None:
                 continue
-            print('\nChecking {}'.format(port.device))
+            _LOG.debug('Checking %s', port.device)
             try:
                 self.serial_port = TelemetrixAioSerial(port.device, 115200,
                                                        telemetrix_aio_instance=self,
                                                        close_loop_on_error=self.close_loop_on_shutdown)
             except SerialException:
                 continue
+            self._transport = self.serial_port
             # create a list of serial ports that we opened
             serial_ports.append(self.serial_port)
 
             # display to the user
-            print('\t' + port.device)
+            _LOG.info('Opened %s', port.device)
 
             # clear out any possible data in the input buffer
             await self.serial_port.reset_input_buffer()
 
         # wait for arduino to reset
-        print('\nWaiting {} seconds(arduino_wait) for Arduino devices to '
-              'reset...'.format(self.arduino_wait))
+        _LOG.info('Waiting %s seconds(arduino_wait) for Arduino devices to '
+                  'reset...', self.arduino_wait)
         await asyncio.sleep(self.arduino_wait)
 
-        print('\nSearching for an Arduino configured with an arduino_instance = ',
-              self.arduino_instance_id)
+        _LOG.info('Searching for an Arduino configured with an arduino_instance = %s',
+                  self.arduino_instance_id)
 
-        for serial_port in serial_ports:
-            self.serial_port = serial_port
+        # probe every candidate port at once - the first port to answer
+        # with a matching arduino_instance_id wins
+        pending = {asyncio.ensure_future(self._probe(serial_port))
+                   for serial_port in serial_ports}
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                serial_port, i_am_here = task.result()
+                if not i_am_here:
+                    continue
 
-            command = [PrivateConstants.ARE_U_THERE]
-            await self._send_command(command)
-            # provide time for the reply
-            await asyncio.sleep(.1)
+                # got an I am here message - is it the correct ID?
+                if i_am_here[2] == self.arduino_instance_id:
+                    for loser in pending:
+                        loser.cancel()
+                    self.serial_port = self._transport = serial_port
+                    self.com_port = serial_port.com_port
+                    return
 
-            i_am_here = await self.serial_port.read(3)
+    async def _probe(self, serial_port):
+        """
+        Send an ARE_U_THERE request to a single serial port and wait
+        for its reply.
 
-            if not i_am_here:
-                continue
+        :param serial_port: TelemetrixAioSerial instance to probe
 
-            # got an I am here message - is it the correct ID?
-            if i_am_here[2] == self.arduino_instance_id:
-                self.com_port = serial_port.com_port
-                return
+        :returns: (serial_port, reply) - reply is None if the port
+                  did not answer in time
+        """
+        await serial_port.write(_ARE_U_THERE_PROBE)
+
+        # wait for the reply, but do not hang on a port that never answers
+        try:
+            i_am_here = await asyncio.wait_for(serial_port.read(3), 1)
+        except asyncio.TimeoutError:
+            i_am_here = None
+        return serial_port, i_am_here
 
     async def _manual_open(self):
         """
@@ -421,26 +568,29 @@ class TelemetrixAIO:
 
         """
         # if port is not found, a serial exception will be thrown
-        print('Opening {} ...'.format(self.com_port))
+        _LOG.info('Opening %s ...', self.com_port)
         self.serial_port = TelemetrixAioSerial(self.com_port, 115200,
                                                telemetrix_aio_instance=self,
                                                close_loop_on_error=self.close_loop_on_shutdown)
+        self._transport = self.serial_port
 
-        print('Waiting {} seconds for the Arduino To Reset.'
-              .format(self.arduino_wait))
+        _LOG.info('Waiting %s seconds for the Arduino To Reset.',
+                  self.arduino_wait)
         await asyncio.sleep(self.arduino_wait)
         command = [PrivateConstants.ARE_U_THERE]
         await self._send_command(command)
-        # provide time for the reply
-        await asyncio.sleep(.1)
 
-        print(f'Searching for correct arduino_instance_id: {self.arduino_instance_id}')
-        i_am_here = await self.serial_port.read(3)
+        _LOG.info('Searching for correct arduino_instance_id: %s',
+                  self.arduino_instance_id)
+        try:
+            i_am_here = await asyncio.wait_for(self.serial_port.read(3), 1)
+        except asyncio.TimeoutError:
+            i_am_here = None
 
         if not i_am_here:
-            print(f'ERROR: correct arduino_instance_id not found')
-
-        print('Correct arduino_instance_id found')
+            _LOG.error('correct arduino_instance_id not found')
+        else:
+            _LOG.info('Correct arduino_instance_id found')
 
     async def _get_firmware_version(self):
         """
@@ -450,13 +600,14 @@ class TelemetrixAIO:
         """
         command = [PrivateConstants.GET_FIRMWARE_VERSION]
         await self._send_command(command)
-        # provide time for the reply
-        await asyncio.sleep(.1)
-        if not self.ip_address:
-            firmware_version = await self.serial_port.read(5)
-        else:
-            firmware_version = list(await self.sock.read(5))
-        return firmware_version
+
+        # wait for the reply - None is returned if it does not arrive in time
+        try:
+            firmware_version = await asyncio.wait_for(
+                self._transport.readexactly(5), 1)
+        except asyncio.TimeoutError:
+            return None
+        return list(firmware_version)
 
     async def analog_write(self, pin, value):
         """
@@ -467,9 +618,7 @@ class TelemetrixAIO:
         :param value: pin value (maximum 16 bits)
 
         """
-        value_msb = value >> 8
-        value_lsb = value & 0xff
-        command = [PrivateConstants.ANALOG_WRITE, pin, value_msb, value_lsb]
+        command = _ANALOG_WRITE.pack(PrivateConstants.ANALOG_WRITE, pin, value)
         await self._send_command(command)
 
     async def digital_write(self, pin, value):
@@ -481,7 +630,7 @@ class TelemetrixAIO:
         :param value: pin value (1 or 0)
 
         """
-        command = [PrivateConstants.DIGITAL_WRITE, pin, value]
+        command = _DIGITAL_WRITE.pack(PrivateConstants.DIGITAL_WRITE, pin, value)
         await self._send_command(command)
 
     async def i2c_read(self, address, register, number_of_bytes,
@@ -567,8 +716,8 @@ class TelemetrixAIO:
                                      write_register=write_register)
 
     async def _i2c_read_request(self, address, register, number_of_bytes,
-                                stop_transmission=True, callback=None,
-                                i2c_port=0, write_register=True):
+                                callback=None, i2c_port=0, write_register=True,
+                                stop_transmission=True):
         """
         This method requests the read of an i2c device. Results are retrieved
         via callback.
@@ -579,41 +728,35 @@ class TelemetrixAIO:
 
         :param number_of_bytes: number of bytes expected to be returned
 
-        :param stop_transmission: stop transmission after read
-
         :param callback: Required callback function to report i2c data as a
                    result of read command.
 
-       :param i2c_port: select the default port (0) or secondary port (1)
+        :param i2c_port: select the default port (0) or secondary port (1)
 
-       :param write_register: If True, the register is written
+        :param write_register: If True, the register is written
                                        before read
                               Else, the write is suppressed
 
-        """
-        if not i2c_port:
-            if not self.i2c_1_active:
-                if self.shutdown_on_exception:
-                    await self.shutdown()
-                raise RuntimeError(
-                    'I2C Read: set_pin_mode i2c never called for i2c port 1.')
+        :param stop_transmission: stop transmission after read
 
-        if i2c_port:
-            if not self.i2c_2_active:
-                if self.shutdown_on_exception:
-                    await self.shutdown()
-                raise RuntimeError(
-                    'I2C Read: set_pin_mode i2c never called for i2c port 2.')
+        callback returns a data list:
 
+         [I2C_READ_REPORT, i2c_port, number of bytes read, address, register,
+          bytes read..., time-stamp]
+
+        """
         if not callback:
             if self.shutdown_on_exception:
                 await self.shutdown()
             raise RuntimeError('I2C Read: A callback function must be specified.')
 
-        if not i2c_port:
-            self.i2c_callback = callback
-        else:
-            self.i2c_callback2 = callback
+        if not self._i2c_active[i2c_port]:
+            if self.shutdown_on_exception:
+                await self.shutdown()
+            raise RuntimeError(
+                f'I2C Read: set_pin_mode i2c never called for i2c port {i2c_port + 1}.')
+
+        self._i2c_callbacks[i2c_port] = callback
 
         if not register:
             register = 0
@@ -631,8 +774,9 @@ class TelemetrixAIO:
         # 5. i2c port
         # 6. suppress write flag
 
-        command = [PrivateConstants.I2C_READ, address, register, number_of_bytes,
-                   stop_transmission, i2c_port, write_register]
+        command = _I2C_READ.pack(PrivateConstants.I2C_READ, address, register,
+                                 number_of_bytes, stop_transmission, i2c_port,
+                                 write_register)
         await self._send_command(command)
 
     async def i2c_write(self, address, args, i2c_port=0):
@@ -644,27 +788,22 @@ class TelemetrixAIO:
         :param i2c_port: 0= port 1, 1 = port 2
 
         :param args: A variable number of bytes to be sent to the device
-                     passed in as a list
+                     passed in as a list, bytes or bytearray
 
         """
-        if not i2c_port:
-            if not self.i2c_1_active:
-                if self.shutdown_on_exception:
-                    await self.shutdown()
-                raise RuntimeError(
-                    'I2C Write: set_pin_mode i2c never called for i2c port 1.')
-
-        if i2c_port:
-            if not self.i2c_2_active:
-                if self.shutdown_on_exception:
-                    await self.shutdown()
-                raise RuntimeError(
-                    'I2C Write: set_pin_mode i2c never called for i2c port 2.')
-
-        command = [PrivateConstants.I2C_WRITE, len(args), address, i2c_port]
+        if not self._i2c_active[i2c_port]:
+            if self.shutdown_on_exception:
+                await self.shutdown()
+            raise RuntimeError(
+                f'I2C Write: set_pin_mode i2c never called for i2c port {i2c_port + 1}.')
 
-        for item in args:
-            command.append(item)
+        length = len(args)
+        packer = _I2C_WRITE.get(length)
+        if packer is None:
+            # command id, number of bytes, address, i2c port, data bytes
+            packer = _I2C_WRITE[length] = struct.Struct(f'>BBBB{length}B')
+        command = packer.pack(PrivateConstants.I2C_WRITE, length, address,
+                              i2c_port, *args)
 
         await self._send_command(command)
 
@@ -809,20 +948,11 @@ class TelemetrixAIO:
               See i2c_read, or i2c_read_restart_transmission.
 
         """
-        # test for i2c port 2
-        if i2c_port:
-            # if not previously activated set it to activated
-            # and the send a begin message for this port
-            if not self.i2c_2_active:
-                self.i2c_2_active = True
-            else:
-                return
-        # port 1
-        else:
-            if not self.i2c_1_active:
-                self.i2c_1_active = True
-            else:
-                return
+        # if not previously activated set it to activated
+        # and the send a begin message for this port
+        if self._i2c_active[i2c_port]:
+            return
+        self._i2c_active[i2c_port] = True
 
         command = [PrivateConstants.I2C_BEGIN, i2c_port]
         await self._send_command(command)
@@ -884,11 +1014,8 @@ class TelemetrixAIO:
         """
         if self.reported_features & PrivateConstants.SERVO_FEATURE:
 
-            minv = (min_pulse).to_bytes(2, byteorder="big")
-            maxv = (max_pulse).to_bytes(2, byteorder="big")
-
-            command = [PrivateConstants.SERVO_ATTACH, pin_number,
-                       minv[0], minv[1], maxv[0], maxv[1]]
+            command = _SERVO_ATTACH.pack(PrivateConstants.SERVO_ATTACH, pin_number,
+                                         min_pulse, max_pulse)
             await self._send_command(command)
         else:
             if self.shutdown_on_exception:
@@ -1168,8 +1295,8 @@ class TelemetrixAIO:
 
         :param chip_select: chip select pin
 
-        :param bytes_to_write: A list of bytes to write. This must
-                                be in the form of a list.
+        :param bytes_to_write: The bytes to write, as a list, bytes
+                               or bytearray.
 
         """
 
@@ -1178,15 +1305,15 @@ class TelemetrixAIO:
                 await self.shutdown()
             raise RuntimeError(f'spi_write_blocking: SPI interface is not enabled.')
 
-        if type(bytes_to_write) is not list:
+        if not isinstance(bytes_to_write, (list, bytes, bytearray)):
             if self.shutdown_on_exception:
                 await self.shutdown()
-            raise RuntimeError('spi_write_blocking: bytes_to_write must be a list.')
-
-        command = [PrivateConstants.SPI_WRITE_BLOCKING, chip_select, len(bytes_to_write)]
+            raise RuntimeError('spi_write_blocking: bytes_to_write must be a list, '
+                               'bytes or bytearray.')
 
-        for data in bytes_to_write:
-            command.append(data)
+        command = bytearray((PrivateConstants.SPI_WRITE_BLOCKING, chip_select,
+                             len(bytes_to_write)))
+        command.extend(bytes_to_write)
 
         await self._send_command(command)
 
@@ -1360,7 +1487,7 @@ class TelemetrixAIO:
     async def onewire_crc8(self, address_list, callback=None):
         """
         Compute a CRC check on an array of data.
-        :param address_list:
+        :param address_list: the data bytes as a list, bytes or bytearray
 
         :param callback: required  function to report a onewire device address
 
@@ -1381,10 +1508,11 @@ class TelemetrixAIO:
                 await self.shutdown()
             raise RuntimeError('onewire_crc8 A Callback must be specified')
 
-        if type(address_list) is not list:
+        if not isinstance(address_list, (list, bytes, bytearray)):
             if self.shutdown_on_exception:
                 await self.shutdown()
-            raise RuntimeError('onewire_crc8: address list must be a list.')
+            raise RuntimeError('onewire_crc8: address list must be a list, bytes or '
+                               'bytearray.')
 
         self.onewire_callback = callback
 
@@ -1419,32 +1547,23 @@ class TelemetrixAIO:
             if self.shutdown_on_exception:
                 await self.shutdown()
             raise RuntimeError('_set_pin_mode: A Callback must be specified')
-        else:
-            if pin_state == PrivateConstants.AT_INPUT:
-                command = [PrivateConstants.SET_PIN_MODE, pin_number,
-                           PrivateConstants.AT_INPUT, 1]
-                self.digital_callbacks[pin_number] = callback
-            elif pin_state == PrivateConstants.AT_INPUT_PULLUP:
-                command = [PrivateConstants.SET_PIN_MODE, pin_number,
-                           PrivateConstants.AT_INPUT_PULLUP, 1]
-                self.digital_callbacks[pin_number] = callback
-            elif pin_state == PrivateConstants.AT_ANALOG:
-                command = [PrivateConstants.SET_PIN_MODE, pin_number,
-                           PrivateConstants.AT_ANALOG,
-                           differential >> 8, differential & 0xff, 1]
-                self.analog_callbacks[pin_number] = callback
-            elif pin_state == PrivateConstants.AT_OUTPUT:
-                command = [PrivateConstants.SET_PIN_MODE, pin_number,
-                           PrivateConstants.AT_OUTPUT, 1]
-            else:
-                if self.shutdown_on_exception:
-                    await self.shutdown()
-                raise RuntimeError('Unknown pin state')
 
-        if command:
-            await self._send_command(command)
+        build_command = _PIN_MODE_COMMANDS.get(pin_state)
+        if build_command is None:
+            if self.shutdown_on_exception:
+                await self.shutdown()
+            raise RuntimeError('Unknown pin state')
+
+        callbacks = _PIN_MODE_CALLBACKS.get(pin_state)
+        if callbacks:
+            getattr(self, callbacks)[pin_number] = callback
 
-        await asyncio.sleep(.05)
+        await self._send_command(build_command(pin_number, differential))
+
+        # the server does not acknowledge the command - give it the time
+        # the transport needs to act on the pin mode before more commands
+        # arrive
+        await asyncio.sleep(self._transport.pin_mode_delay)
 
     async def servo_detach(self, pin_number):
         """
@@ -1464,7 +1583,7 @@ class TelemetrixAIO:
         :param angle: angle (0-180)
 
         """
-        command = [PrivateConstants.SERVO_WRITE, pin_number, angle]
+        command = _SERVO_WRITE.pack(PrivateConstants.SERVO_WRITE, pin_number, angle)
         await self._send_command(command)
 
     async def stepper_move_to(self, motor_id, position):
@@ -1495,12 +1614,8 @@ class TelemetrixAIO:
             polarity = 0
         position = abs(position)
 
-        position_bytes = list(position.to_bytes(4, 'big', signed=True))
-
-        command = [PrivateConstants.STEPPER_MOVE_TO, motor_id]
-        for value in position_bytes:
-            command.append(value)
-        command.append(polarity)
+        command = _STEPPER_POSITION.pack(PrivateConstants.STEPPER_MOVE_TO,
+                                         motor_id, position, polarity)
 
         await self._send_command(command)
 
@@ -1525,12 +1640,8 @@ class TelemetrixAIO:
             polarity = 0
         position = abs(relative_position)
 
-        position_bytes = list(position.to_bytes(4, 'big', signed=True))
-
-        command = [PrivateConstants.STEPPER_MOVE, motor_id]
-        for value in position_bytes:
-            command.append(value)
-        command.append(polarity)
+        command = _STEPPER_POSITION.pack(PrivateConstants.STEPPER_MOVE,
+                                         motor_id, position, polarity)
         await self._send_command(command)
 
     async def stepper_run(self, motor_id, completion_callback=None):
@@ -1610,11 +1721,8 @@ class TelemetrixAIO:
             raise RuntimeError('stepper_set_max_speed: Speed range is 1 - 1000.')
 
         self.stepper_info_list[motor_id]['max_speed'] = max_speed
-        max_speed_msb = (max_speed & 0xff00) >> 8
-        max_speed_lsb = max_speed & 0xff
-
-        command = [PrivateConstants.STEPPER_SET_MAX_SPEED, motor_id, max_speed_msb,
-                   max_speed_lsb]
+        command = _STEPPER_U16.pack(PrivateConstants.STEPPER_SET_MAX_SPEED,
+                                    motor_id, max_speed)
         await self._send_command(command)
 
     async def stepper_get_max_speed(self, motor_id):
@@ -1661,11 +1769,8 @@ class TelemetrixAIO:
 
         self.stepper_info_list[motor_id]['acceleration'] = acceleration
 
-        max_accel_msb = acceleration >> 8
-        max_accel_lsb = acceleration & 0xff
-
-        command = [PrivateConstants.STEPPER_SET_ACCELERATION, motor_id, max_accel_msb,
-                   max_accel_lsb]
+        command = _STEPPER_U16.pack(PrivateConstants.STEPPER_SET_ACCELERATION,
+                                    motor_id, acceleration)
         await self._send_command(command)
 
     async def stepper_set_speed(self, motor_id, speed):
@@ -1703,13 +1808,8 @@ class TelemetrixAIO:
                 await self.shutdown()
             raise RuntimeError('stepper_move: Invalid motor_id.')
 
-        position_bytes = list(speed.to_bytes(2, 'big', signed=True))
-
-        command = [PrivateConstants.STEPPER_SET_SPEED, motor_id]
-
-        for value in position_bytes:
-            command.append(value)
-        command.append(polarity)
+        command = _STEPPER_SPEED.pack(PrivateConstants.STEPPER_SET_SPEED,
+                                      motor_id, speed, polarity)
         await self._send_command(command)
 
     async def stepper_get_speed(self, motor_id):
@@ -1839,11 +1939,8 @@ class TelemetrixAIO:
             if self.shutdown_on_exception:
                 await self.shutdown()
             raise RuntimeError('stepper_set_current_position: Invalid motor_id.')
-        position_bytes = list(position.to_bytes(4, 'big',  signed=True))
-
-        command = [PrivateConstants.STEPPER_SET_CURRENT_POSITION, motor_id]
-        for value in position_bytes:
-            command.append(value)
+        command = _STEPPER_SET_POSITION.pack(
+            PrivateConstants.STEPPER_SET_CURRENT_POSITION, motor_id, position)
         await self._send_command(command)
 
     async def stepper_run_speed_to_position(self, motor_id, completion_callback=None):
@@ -1960,11 +2057,8 @@ class TelemetrixAIO:
             raise RuntimeError('stepper_set_min_pulse_width: Pulse width range = '
                                '0-0xffff.')
 
-        width_msb = minimum_width >> 8
-        width_lsb = minimum_width & 0xff
-
-        command = [PrivateConstants.STEPPER_SET_MINIMUM_PULSE_WIDTH, motor_id, width_msb,
-                   width_lsb]
+        command = _STEPPER_U16.pack(PrivateConstants.STEPPER_SET_MINIMUM_PULSE_WIDTH,
+                                    motor_id, minimum_width)
         await self._send_command(command)
 
     async def stepper_set_enable_pin(self, motor_id, pin=0xff):
@@ -2083,21 +2177,19 @@ class TelemetrixAIO:
         self.shutdown_flag = True
         # stop all reporting - both analog and digital
         try:
-            if self.serial_port:
-                command = [PrivateConstants.STOP_ALL_REPORTS]
-                await self._send_command(command)
-
-                time.sleep(.5)
-
-                await self.serial_port.reset_input_buffer()
-                await self.serial_port.close()
-                if self.close_loop_on_shutdown:
-                    self.loop.stop()
-            elif self.sock:
+            if self._transport:
                 command = [PrivateConstants.STOP_ALL_REPORTS]
                 await self._send_command(command)
-                self.the_task.cancel()
-                time.sleep(.5)
+                await self.flush()
+                # when called from a report handler, the handler task
+                # exits on its own once the handler returns, and then
+                # stops the dispatcher
+                if self.the_task and \
+                        asyncio.current_task() is not self._report_task:
+                    self.the_task.cancel()
+                    # return as soon as the dispatcher has exited
+                    await asyncio.wait({self.the_task}, timeout=.5)
+                await self._transport.close()
                 if self.close_loop_on_shutdown:
                     self.loop.stop()
         except (RuntimeError, SerialException):
@@ -2107,9 +2199,7 @@ class TelemetrixAIO:
         """
         Disable reporting for all digital and analog input pins
         """
-        command = [PrivateConstants.MODIFY_REPORTING,
-                   PrivateConstants.REPORTING_DISABLE_ALL, 0]
-        await self._send_command(command)
+        await self._send_frame(_DISABLE_ALL_REPORTING)
 
     async def disable_analog_reporting(self, pin):
         """
@@ -2118,9 +2208,7 @@ class TelemetrixAIO:
         :param pin: Analog pin number. For example for A0, the number is 0.
 
         """
-        command = [PrivateConstants.MODIFY_REPORTING,
-                   PrivateConstants.REPORTING_ANALOG_DISABLE, pin]
-        await self._send_command(command)
+        await self._send_frame(_DISABLE_ANALOG_REPORTING[pin])
 
     async def disable_digital_reporting(self, pin):
         """
@@ -2130,9 +2218,7 @@ class TelemetrixAIO:
         :param pin: pin number
 
         """
-        command = [PrivateConstants.MODIFY_REPORTING,
-                   PrivateConstants.REPORTING_DIGITAL_DISABLE, pin]
-        await self._send_command(command)
+        await self._send_frame(_DISABLE_DIGITAL_REPORTING[pin])
 
     async def enable_analog_reporting(self, pin):
         """
@@ -2142,9 +2228,7 @@ class TelemetrixAIO:
 
 
         """
-        command = [PrivateConstants.MODIFY_REPORTING,
-                   PrivateConstants.REPORTING_ANALOG_ENABLE, pin]
-        await self._send_command(command)
+        await self._send_frame(_ENABLE_ANALOG_REPORTING[pin])
 
     async def enable_digital_reporting(self, pin):
         """
@@ -2153,109 +2237,224 @@ class TelemetrixAIO:
         :param pin: Pin number.
         """
 
-        command = [PrivateConstants.MODIFY_REPORTING,
-                   PrivateConstants.REPORTING_DIGITAL_ENABLE, pin]
-        await self._send_command(command)
+        await self._send_frame(_ENABLE_DIGITAL_REPORTING[pin])
+
+    @contextlib.asynccontextmanager
+    async def batch(self):
+        """
+        Hold back the commands issued inside the block and send them
+        in a single write when the block exits. This works whether or
+        not coalesce_writes is set.
+
+        Usage:
+
+            async with board.batch():
+                await board.digital_write(5, 1)
+                await board.servo_write(9, 90)
+        """
+        self._tx_batch_depth += 1
+        try:
+            yield
+        finally:
+            self._tx_batch_depth -= 1
+            if not self._tx_batch_depth:
+                await self.flush()
+
+    async def flush(self):
+        """
+        Send any commands held back by write coalescing.
+
+        This only has an effect when coalesce_writes was set to True.
+        Inside a batch() block it does nothing - the commands are sent
+        together when the block exits.
+        """
+        self._tx_scheduled = False
+        if not self._tx_buf or self._tx_batch_depth:
+            return
+        send_message = bytes(self._tx_buf)
+        self._tx_buf.clear()
+        await self._write(send_message)
 
     async def _arduino_report_dispatcher(self):
         """
         This is a private method.
-        It continually accepts and interprets data coming from Telemetrix4Arduino,and then
-        dispatches the correct handler to process the data.
+        It continually accepts data coming from Telemetrix4Arduino, and hands
+        each report to _report_consumer, which dispatches the correct handler
+        to process the data. Reading runs in this task and handling in its own
+        task, so that a slow callback does not hold up reading from the
+        serial port or socket.
 
         It first receives the length of the packet, and then reads in the rest of the
         packet. A packet consists of a length, report identifier and then the report data.
-        Using the report identifier, the report handler is fetched from report_dispatch.
 
-        :returns: This method never returns
+        :returns: When the connection is closed or shutdown() is called
         """
+        # bounded, so that reading pauses if the handlers fall behind
+        reports = asyncio.Queue(maxsize=_REPORT_QUEUE_SIZE)
+        consumer = self._report_task = self.loop.create_task(
+            self._report_consumer(reports))
 
-        while True:
-            if self.shutdown_flag:
-                break
-            try:
-                if not self.ip_address:
-                    packet_length = await self.serial_port.read()
-                else:
+        # if the handler task exits, because a handler failed or called
+        # shutdown(), stop reading as well
+        reader = asyncio.current_task()
 
-                    packet_length = ord(await self.sock.read())
+        def stop_reading(_):
+            reader.cancel()
 
-            except TypeError:
-                continue
+        consumer.add_done_callback(stop_reading)
 
-            # get the rest of the packet
-            if not self.ip_address:
-                packet = await self.serial_port.read(packet_length)
-            else:
-                packet = list(await self.sock.read(packet_length))
+        # look these up once rather than for every report
+        put = reports.put
+        sleep = asyncio.sleep
+        now = time.time
+        read = self._transport.readexactly
+
+        # reads return without yielding when data is already buffered,
+        # so give other tasks a turn now and then during a steady stream
+        reports_until_yield = _DISPATCH_YIELD_INTERVAL
+
+        try:
+            while True:
+                if self.shutdown_flag:
+                    break
+                # read the packet length and then the rest of the packet
+                header = await read(1)
+                if not header:
+                    # the connection was closed
+                    break
+                packet_length = header[0]
+                packet = await read(packet_length)
+                if len(packet) < packet_length:
+                    # the connection was closed part way through a report
+                    break
+
+                # time stamp the report as it arrives
+                await put((packet, now()))
+
+                reports_until_yield -= 1
+                if not reports_until_yield:
+                    reports_until_yield = _DISPATCH_YIELD_INTERVAL
+                    await sleep(0)
+
+            # let the handlers finish off the reports already queued
+            consumer.remove_done_callback(stop_reading)
+            await put(None)
+            await consumer
+            self.shutdown_flag = True
+        except asyncio.CancelledError:
+            # if the handler task stopped us, pass on a handler exception
+            if consumer.done() and not consumer.cancelled():
+                consumer.result()
+            raise
+        finally:
+            if not consumer.done():
+                consumer.cancel()
+
+    async def _report_consumer(self, reports):
+        """
+        This is a private method.
+        It takes the reports queued by _arduino_report_dispatcher and, using the
+        report identifier, calls the report handler fetched from report_dispatch.
+        Handlers are passed the packet with the report identifier still at index 0,
+        so that no copy of the report data is needed, and the time stamp taken
+        when the packet was received.
+
+        :param reports: queue of (packet bytes, time stamp) tuples,
+                        ended by None
+
+        :returns: When None is received or a handler calls shutdown()
+        """
+        # look these up once rather than for every report
+        dispatch = self.report_dispatch
+        get = reports.get
+        sleep = asyncio.sleep
+        sleep_tune = self.sleep_tune
 
-            report = packet[0]
-            # print(report)
-            # handle all other messages by looking them up in the
-            # command dictionary
+        while True:
+            report = await get()
+            if report is None:
+                return
+            packet, time_stamp = report
+            await dispatch[packet[0]](packet, time_stamp)
 
-            await self.report_dispatch[report](packet[1:])
-            await asyncio.sleep(self.sleep_tune)
+            if self.shutdown_flag:
+                return
+            if sleep_tune:
+                await sleep(sleep_tune)
 
     '''
     Report message handlers
     '''
 
-    async def _report_loop_data(self, data):
+    async def _report_unknown(self, data, time_stamp):
+        """
+        Ignore a report that has no handler
+
+        :param data: report packet
+        """
+
+    async def _report_loop_data(self, data, time_stamp):
         """
         Print data that was looped back
 
-        :param data: byte of loop back data
+        :param data: data[1] = byte of loop back data
         """
         if self.loop_back_callback:
-            await self.loop_back_callback(data)
+            await self.loop_back_callback([data[1]])
 
-    async def _spi_report(self, report):
+    async def _spi_report(self, report, time_stamp):
 
-        cb_list = [PrivateConstants.SPI_REPORT, report[0]] + report[1:]
-
-        cb_list.append(time.time())
+        # the packet already is [SPI_REPORT, report data...]
+        cb_list = [*report, time_stamp]
 
         await self.spi_callback(cb_list)
 
-    async def _onewire_report(self, report):
-        cb_list = [PrivateConstants.ONE_WIRE_REPORT, report[0]] + report[1:]
-        cb_list.append(time.time())
+    async def _onewire_report(self, report, time_stamp):
+        # the packet already is [ONE_WIRE_REPORT, report data...]
+        cb_list = [*report, time_stamp]
         await self.onewire_callback(cb_list)
 
-    async def _report_debug_data(self, data):
+    async def _report_debug_data(self, data, time_stamp):
         """
-        Print debug data sent from Arduino
+        Log debug data sent from Arduino. It is logged at DEBUG level,
+        so enable that level, for example with
+        logging.basicConfig(level=logging.DEBUG), to see it.
 
-        :param data: data[0] is a byte followed by 2
+        :param data: data[1] is a byte followed by 2
                      bytes that comprise an integer
         """
-        value = (data[1] << 8) + data[2]
-        print(f'DEBUG ID: {data[0]} Value: {value}')
+        if not _LOG.isEnabledFor(logging.DEBUG):
+            return
+        value, = _U16BE.unpack_from(data, 2)
+        _LOG.debug('DEBUG ID: %d Value: %d', data[1], value)
 
-    async def _analog_message(self, data):
+    async def _analog_message(self, data, time_stamp, callbacks):
         """
         This is a private message handler method.
         It is a message handler for analog messages.
 
         :param data: message data
 
+        :param callbacks: analog callbacks, indexed by pin number
+
         """
-        pin = data[0]
-        value = (data[1] << 8) + data[2]
+        pin = data[1]
+        cb = callbacks[pin]
+        if cb is None:
+            return
 
-        time_stamp = time.time()
+        value, = _U16BE.unpack_from(data, 2)
 
         # append pin number, pin value, and pin type to return value and return as a list
         message = [PrivateConstants.AT_ANALOG, pin, value, time_stamp]
 
-        await self.analog_callbacks[pin](message)
+        await cb(message)
 
-    async def _dht_report(self, data):
+    async def _dht_report(self, data, time_stamp, callbacks):
         """
         This is a private message handler for dht reports
 
-        :param data:            data[0] = report error return
+        :param data:            data[1] = report error return
                                     No Errors = 0
 
                                     Checksum Error = 1
@@ -2264,267 +2463,354 @@ class TelemetrixAIO:
 
                                     Invalid Value = 999
 
-                                data[1] = pin number
+                                data[2] = pin number
 
-                                data[2] = dht type 11 or 22
+                                data[3] = dht type 11 or 22
 
-                                data[3] = humidity positivity flag
+                                data[4] = humidity positivity flag
 
-                                data[4] = temperature positivity value
+                                data[5] = temperature positivity value
 
-                                data[5] = humidity integer
+                                data[6] = humidity integer
 
-                                data[6] = humidity fractional value
+                                data[7] = humidity fractional value
 
-                                data[7] = temperature integer
+                                data[8] = temperature integer
 
-                                data[8] = temperature fractional value
+                                data[9] = temperature fractional value
         """
-        if data[0]:  # DHT_ERROR
+        cb = callbacks[data[2]]
+        if cb is None:
+            return
+
+        if data[1]:  # DHT_ERROR
             # error report
-            # data[0] = report sub type, data[1] = pin, data[2] = error message
-            if self.dht_callbacks[data[1]]:
-                # Callback 0=DHT REPORT, DHT_ERROR, PIN, Time
-                message = [PrivateConstants.DHT_REPORT, data[0], data[1], data[2],
-                           time.time()]
-                await self.dht_callbacks[data[1]](message)
+            # data[1] = report sub type, data[2] = pin, data[3] = error message
+            # Callback 0=DHT REPORT, DHT_ERROR, PIN, Time
+            message = [PrivateConstants.DHT_REPORT, data[1], data[2], data[3],
+                       time_stamp]
+            await cb(message)
         else:
             # got valid data DHT_DATA
-            f_humidity = float(data[5] + data[6] / 100)
-            if data[3]:
-                f_humidity *= -1.0
-            f_temperature = float(data[7] + data[8] / 100)
+            # values arrive as an integer part and hundredths, with a
+            # separate sign flag for each
+            f_humidity = data[6] + data[7] / 100
             if data[4]:
-                f_temperature *= -1.0
-            message = [PrivateConstants.DHT_REPORT, data[0], data[1], data[2],
-                       f_humidity, f_temperature, time.time()]
+                f_humidity = -f_humidity
+            f_temperature = data[8] + data[9] / 100
+            if data[5]:
+                f_temperature = -f_temperature
+            message = [PrivateConstants.DHT_REPORT, data[1], data[2], data[3],
+                       f_humidity, f_temperature, time_stamp]
 
-            await self.dht_callbacks[data[1]](message)
+            await cb(message)
 
-    async def _digital_message(self, data):
+    async def _digital_message(self, data, time_stamp, callbacks):
         """
         This is a private message handler method.
         It is a message handler for Digital Messages.
 
         :param data: digital message
 
+        :param callbacks: digital callbacks, indexed by pin number
+
         """
-        pin = data[0]
-        value = data[1]
+        pin = data[1]
+        cb = callbacks[pin]
+        if cb is None:
+            return
 
-        time_stamp = time.time()
-        if self.digital_callbacks[pin]:
-            message = [PrivateConstants.DIGITAL_REPORT, pin, value, time_stamp]
-            await self.digital_callbacks[pin](message)
+        message = [PrivateConstants.DIGITAL_REPORT, pin, data[2], time_stamp]
+        await cb(message)
 
-    async def _servo_unavailable(self, report):
+    async def _servo_unavailable(self, report, time_stamp):
         """
         Message if no servos are available for use.
 
-        :param report: pin number
+        :param report: report[1] = pin number
         """
         if self.shutdown_on_exception:
             await self.shutdown()
         raise RuntimeError(
-            f'Servo Attach For Pin {report[0]} Failed: No Available Servos')
+            f'Servo Attach For Pin {report[1]} Failed: No Available Servos')
 
-    async def _i2c_read_report(self, data):
+    async def _i2c_read_report(self, data, time_stamp):
         """
         Execute callback for i2c reads.
 
         :param data: [I2C_READ_REPORT, i2c_port, number of bytes read, address, register, bytes read..., time-stamp]
         """
 
-        # we receive [# data bytes, address, register, data bytes]
-        # number of bytes of data returned
-
-        # data[0] = number of bytes
+        # data[0] = I2C_READ_REPORT
         # data[1] = i2c_port
         # data[2] = number of bytes returned
         # data[3] = address
         # data[4] = register
         # data[5] ... all the data bytes
 
-        cb_list = [PrivateConstants.I2C_READ_REPORT, data[0], data[1]] + data[2:]
-        cb_list.append(time.time())
+        cb = self._i2c_callbacks[data[1]]
+        if cb is None:
+            return
 
-        if cb_list[1]:
-            await self.i2c_callback2(cb_list)
-        else:
-            await self.i2c_callback(cb_list)
+        # the packet already has the callback list layout
+        await cb([*data, time_stamp])
 
-    async def _i2c_too_few(self, data):
+    async def _i2c_too_few(self, data, time_stamp):
         """
         I2c reports too few bytes received
 
-        :param data: data[0] = device address
+        :param data: data[1] = i2c port, data[2] = device address
         """
         if self.shutdown_on_exception:
             await self.shutdown()
         raise RuntimeError(
-            f'i2c too few bytes received from i2c port {data[0]} i2c address {data[1]}')
+            f'i2c too few bytes received from i2c port {data[1]} i2c address {data[2]}')
 
-    async def _i2c_too_many(self, data):
+    async def _i2c_too_many(self, data, time_stamp):
         """
         I2c reports too few bytes received
 
-        :param data: data[0] = device address
+        :param data: data[1] = i2c port, data[2] = device address
         """
         if self.shutdown_on_exception:
             await self.shutdown()
         raise RuntimeError(
-            f'i2c too many bytes received from i2c port {data[0]} i2c address {data[1]}')
+            f'i2c too many bytes received from i2c port {data[1]} i2c address {data[2]}')
 
-    async def _sonar_distance_report(self, report):
+    async def _sonar_distance_report(self, report, time_stamp, callbacks):
         """
 
-        :param report: data[0] = trigger pin, data[1] and data[2] = distance
+        :param report: data[1] = trigger pin, data[2] and data[3] = distance
 
         callback report format: [PrivateConstants.SONAR_DISTANCE, trigger_pin, distance_value, time_stamp]
         """
 
         # get callback from pin number
-        cb = self.sonar_callbacks[report[0]]
+        cb = callbacks[report[1]]
+        if cb is None:
+            return
 
         # build report data
-        cb_list = [PrivateConstants.SONAR_DISTANCE, report[0],
-                   ((report[1] << 8) + report[2]), time.time()]
+        distance, = _U16BE.unpack_from(report, 2)
+        cb_list = [PrivateConstants.SONAR_DISTANCE, report[1], distance, time_stamp]
 
         await cb(cb_list)
 
-    async def _stepper_distance_to_go_report(self, report):
+    async def _stepper_distance_to_go_report(self, report, time_stamp):
         """
         Report stepper distance to go.
 
-        :param report: data[0] = motor_id, data[1] = steps MSB, data[2] = steps byte 1,
-                                 data[3] = steps bytes 2, data[4] = steps LSB
+        :param report: data[1] = motor_id, data[2] = steps MSB, data[3] = steps byte 1,
+                                 data[4] = steps bytes 2, data[5] = steps LSB
 
         callback report format: [PrivateConstants.STEPPER_DISTANCE_TO_GO, motor_id
                                  steps, time_stamp]
         """
 
         # get callback
-        cb = self.stepper_info_list[report[0]]['distance_to_go_callback']
-
-        # isolate the steps bytes and covert list to bytes
-        steps = bytes(report[1:])
+        cb = self.stepper_info_list[report[1]]['distance_to_go_callback']
 
         # get value from steps
-        num_steps = int.from_bytes(steps, byteorder='big', signed=True)
+        num_steps, = _I32BE.unpack_from(report, 2)
 
-        cb_list = [PrivateConstants.STEPPER_DISTANCE_TO_GO, report[0], num_steps,
-                   time.time()]
+        cb_list = [PrivateConstants.STEPPER_DISTANCE_TO_GO, report[1], num_steps,
+                   time_stamp]
 
         await cb(cb_list)
 
-    async def _stepper_target_position_report(self, report):
+    async def _stepper_target_position_report(self, report, time_stamp):
         """
         Report stepper target position to go.
 
-        :param report: data[0] = motor_id, data[1] = target position MSB,
-                       data[2] = target position byte MSB+1
-                       data[3] = target position byte MSB+2
-                       data[4] = target position LSB
+        :param report: data[1] = motor_id, data[2] = target position MSB,
+                       data[3] = target position byte MSB+1
+                       data[4] = target position byte MSB+2
+                       data[5] = target position LSB
 
         callback report format: [PrivateConstants.STEPPER_TARGET_POSITION, motor_id
                                  target_position, time_stamp]
         """
 
         # get callback
-        cb = self.stepper_info_list[report[0]]['target_position_callback']
-
-        # isolate the steps bytes and covert list to bytes
-        target = bytes(report[1:])
+        cb = self.stepper_info_list[report[1]]['target_position_callback']
 
         # get value from steps
-        target_position = int.from_bytes(target, byteorder='big', signed=True)
+        target_position, = _I32BE.unpack_from(report, 2)
 
-        cb_list = [PrivateConstants.STEPPER_TARGET_POSITION, report[0], target_position,
-                   time.time()]
+        cb_list = [PrivateConstants.STEPPER_TARGET_POSITION, report[1], target_position,
+                   time_stamp]
 
         await cb(cb_list)
 
-    async def _stepper_current_position_report(self, report):
+    async def _stepper_current_position_report(self, report, time_stamp):
         """
         Report stepper current position.
 
-        :param report: data[0] = motor_id, data[1] = current position MSB,
-                       data[2] = current position byte MSB+1
-                       data[3] = current position byte MSB+2
-                       data[4] = current position LSB
+        :param report: data[1] = motor_id, data[2] = current position MSB,
+                       data[3] = current position byte MSB+1
+                       data[4] = current position byte MSB+2
+                       data[5] = current position LSB
 
         callback report format: [PrivateConstants.STEPPER_CURRENT_POSITION, motor_id
                                  current_position, time_stamp]
         """
 
         # get callback
-        cb = self.stepper_info_list[report[0]]['current_position_callback']
-
-        # isolate the steps bytes and covert list to bytes
-        position = bytes(report[1:])
+        cb = self.stepper_info_list[report[1]]['current_position_callback']
 
         # get value from steps
-        current_position = int.from_bytes(position, byteorder='big', signed=True)
+        current_position, = _I32BE.unpack_from(report, 2)
 
-        cb_list = [PrivateConstants.STEPPER_CURRENT_POSITION, report[0], current_position,
-                   time.time()]
+        cb_list = [PrivateConstants.STEPPER_CURRENT_POSITION, report[1], current_position,
+                   time_stamp]
 
         await cb(cb_list)
 
-    async def _stepper_is_running_report(self, report):
+    async def _stepper_is_running_report(self, report, time_stamp):
         """
         Report if the motor is currently running
 
-        :param report: data[0] = motor_id, True if motor is running or False if it is not.
+        :param report: data[1] = motor_id, data[2] = True if motor is running
+                       or False if it is not.
 
         callback report format: [18, motor_id,
                                  running_state, time_stamp]
         """
 
         # get callback
-        cb = self.stepper_info_list[report[0]]['is_running_callback']
+        cb = self.stepper_info_list[report[1]]['is_running_callback']
 
-        cb_list = [PrivateConstants.STEPPER_RUNNING_REPORT, report[0], time.time()]
+        cb_list = [PrivateConstants.STEPPER_RUNNING_REPORT, report[1], time_stamp]
 
         await cb(cb_list)
 
-    async def _stepper_run_complete_report(self, report):
+    async def _stepper_run_complete_report(self, report, time_stamp):
         """
         The motor completed it motion
 
-        :param report: data[0] = motor_id
+        :param report: data[1] = motor_id
 
         callback report format: [PrivateConstants.STEPPER_RUN_COMPLETE_REPORT, motor_id,
                                  time_stamp]
         """
 
         # get callback
-        cb = self.stepper_info_list[report[0]]['motion_complete_callback']
+        cb = self.stepper_info_list[report[1]]['motion_complete_callback']
 
-        cb_list = [PrivateConstants.STEPPER_RUN_COMPLETE_REPORT, report[0],
-                   time.time()]
+        cb_list = [PrivateConstants.STEPPER_RUN_COMPLETE_REPORT, report[1],
+                   time_stamp]
 
         await cb(cb_list)
 
-    async def _features_report(self, report):
-        self.reported_features = report[0]
+    async def _features_report(self, report, time_stamp):
+        self.reported_features = report[1]
 
     async def _send_command(self, command):
         """
         This is a private utility method.
 
 
-        :param command:  command data in the form of a list
+        :param command:  command data as a list, bytes or bytearray
 
         :returns: number of bytes sent
         """
-        # the length of the list is added at the head
-        command.insert(0, len(command))
-        # print(command)
-        send_message = bytes(command)
+        # the length of the command is added at the head
+        length = len(command)
 
-        if not self.ip_address:
-            await self.serial_port.write(send_message)
-        else:
-            await self.sock.write(send_message)
-            # await asyncio.sleep(.1)
+        if self.coalesce_writes or self._tx_batch_depth:
+            # hold the command until the loop gets a chance to run the flush
+            self._tx_buf.append(length)
+            self._tx_buf.extend(command)
+            self._schedule_flush()
+            return
+
+        if length >= _FRAME_BUFFER_SIZE:
+            # too large for a pooled buffer
+            send_message = bytearray((length,))
+            send_message.extend(command)
+            await self._write(send_message)
+            return
+
+        frame = self._acquire_buf()
+        try:
+            frame[0] = length
+            frame[1:length + 1] = command
+            await self._write(memoryview(frame)[:length + 1])
+        finally:
+            self._release_buf(frame)
+
+    async def _send_frame(self, frame):
+        """
+        This is a private utility method.
+
+        Send a command that already carries its length byte.
+
+        :param frame: framed command as bytes
+        """
+        if self.coalesce_writes or self._tx_batch_depth:
+            self._tx_buf += frame
+            self._schedule_flush()
+            return
+
+        await self._write(frame)
+
+    def _schedule_flush(self):
+        """
+        This is a private utility method.
+
+        Arrange for held back commands to be sent once the loop gets
+        a chance to run. Inside a batch() block, they are sent when
+        the block exits instead.
+        """
+        if self._tx_batch_depth:
+            return
+        if not self._tx_scheduled:
+            self._tx_scheduled = True
+            self._tx_flush_task = self.loop.create_task(self.flush())
+            self._tx_flush_task.add_done_callback(self._flush_done)
+
+    @staticmethod
+    def _flush_done(task):
+        """
+        This is a private utility method.
+
+        Log the failure of a scheduled flush, which nothing awaits.
+
+        :param task: the finished flush task
+        """
+        if not task.cancelled() and task.exception() is not None:
+            _LOG.error('Sending coalesced commands failed',
+                       exc_info=task.exception())
+
+    def _acquire_buf(self):
+        """
+        This is a private utility method.
+
+        :returns: a frame buffer from the pool, or a new one if the
+                  pool is empty
+        """
+        try:
+            return self._cmd_pool.pop()
+        except IndexError:
+            return bytearray(_FRAME_BUFFER_SIZE)
+
+    def _release_buf(self, frame):
+        """
+        This is a private utility method.
+
+        Return a frame buffer to the pool. Buffers are overwritten on
+        reuse, so there is nothing to clear.
+
+        :param frame: buffer obtained from _acquire_buf
+        """
+        self._cmd_pool.append(frame)
+
+    async def _write(self, send_message):
+        """
+        This is a private utility method.
+
+        Write a framed message to the serial port or socket.
+
+        :param send_message: bytes to be written
+        """
+        await self._transport.write(send_message)
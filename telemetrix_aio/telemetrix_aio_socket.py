@@ -18,8 +18,11 @@
 
 
 import asyncio
+import logging
 import sys
 
+_LOG = logging.getLogger(__name__)
+
 
 # noinspection PyStatementEffect,PyUnresolvedReferences,PyUnresolvedReferences
 class TelemetrixAioSocket:
@@ -27,6 +30,11 @@ class TelemetrixAioSocket:
     This class encapsulates management of a tcp/ip connection that communicates
     with the StandardFirmataWiFi
     """
+
+    # TCP flow control keeps the server from being overrun, so pin mode
+    # commands need no pause after them
+    pin_mode_delay = 0
+
     def __init__(self, ip_address, ip_port, loop):
         self.ip_address = ip_address
         self.ip_port = ip_port
@@ -43,9 +51,10 @@ class TelemetrixAioSocket:
         try:
             self.reader, self.writer = await asyncio.open_connection(
                 self.ip_address, self.ip_port)
-            print(f'Successfully connected to: {self.ip_address}:{self.ip_port}')
+            _LOG.info('Successfully connected to: %s:%s', self.ip_address,
+                      self.ip_port)
         except OSError:
-            print("Can't open connection to " + self.ip_address)
+            _LOG.error("Can't open connection to %s", self.ip_address)
             sys.exit(0)
 
     async def write(self, data):
@@ -69,11 +78,35 @@ class TelemetrixAioSocket:
         self.writer.write(to_wifi)
         await self.writer.drain()
 
+    async def close(self):
+        """
+        This method closes the connection to the IP device
+
+        :return: None
+        """
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+
     async def read(self, num_bytes=1):
         """
-        This method reads one byte of data from IP device
+        This method delegates to readexactly().
+        """
+        return await self.readexactly(num_bytes)
 
-        :return: Next byte
+    async def readexactly(self, num_bytes):
         """
-        buffer = await self.reader.read(num_bytes)
-        return buffer
+        This method reads num_bytes of data from the IP device.
+        Reads are served from the stream reader's buffer, so a single
+        receive from the socket usually satisfies several reports.
+
+        :return: bytes read - fewer than num_bytes only if the connection
+                 was closed
+        """
+        try:
+            return await self.reader.readexactly(num_bytes)
+        except asyncio.IncompleteReadError as e:
+            return e.partial
@@ -20,6 +20,7 @@ import asyncio
 import sys
 import serial
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 LF = 0x0a
 
@@ -32,6 +33,10 @@ class TelemetrixAioSerial:
     It provides a 'futures' interface to make Pyserial compatible with asyncio
     """
 
+    # the Arduino does not acknowledge pin mode commands and its serial
+    # receive buffer is small, so pause for this long after each one
+    pin_mode_delay = .05
+
     def __init__(self, com_port='/dev/ttyACM0', baud_rate=115200, sleep_tune=.0001,
                  telemetrix_aio_instance=None, close_loop_on_error=True):
 
@@ -59,6 +64,11 @@ class TelemetrixAioSerial:
         # used by read_until
         self.start_time = None
 
+        # writes are handed to a single worker thread so that a slow or
+        # stalled port does not block the event loop. With one worker,
+        # writes complete in the order they were issued.
+        self.tx_executor = ThreadPoolExecutor(max_workers=1)
+
     async def get_serial(self):
         """
         This method returns a reference to the serial port in case the
@@ -72,7 +82,7 @@ class TelemetrixAioSerial:
         """
         This is an asyncio adapted version of pyserial write. It provides a
         non-blocking  write and returns the number of bytes written upon
-        completion
+        completion. The pyserial write itself runs on a worker thread.
 
         :param data: Data to be written
         :return: Number of bytes written
@@ -82,7 +92,12 @@ class TelemetrixAioSerial:
         result = None
         try:
             # result = self.my_serial.write(bytes([ord(data)]))
-            result = self.my_serial.write(bytes(data))
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self.tx_executor, self.my_serial.write, bytes(data))
+            except RuntimeError:
+                # the executor was shut down by close()
+                raise serial.SerialException('write to a closed port')
 
         except serial.SerialException:
             # noinspection PyBroadException
@@ -114,7 +129,8 @@ class TelemetrixAioSerial:
         This is an asyncio adapted version of pyserial read
         that provides non-blocking read.
 
-        :return: One character
+        :return: One character as an integer if size is 1,
+                 otherwise the bytes read
         """
 
         # create an asyncio Future
@@ -143,7 +159,7 @@ class TelemetrixAioSerial:
                     if size == 1:
                         future.set_result(ord(data))
                     else:
-                        future.set_result(list(data))
+                        future.set_result(data)
             else:
                 # wait for the future to complete
                 if not future.done():
@@ -152,6 +168,21 @@ class TelemetrixAioSerial:
                     # future is done, so return the character
                     return future.result()
 
+    async def readexactly(self, size):
+        """
+        Read exactly size bytes. Unlike read(), the result is always
+        bytes, and the pyserial read is only made once all of the bytes
+        have arrived, so it never blocks the event loop waiting for the
+        rest of a report.
+
+        :param size: number of bytes to read
+
+        :return: bytes read
+        """
+        while self.my_serial.in_waiting < size:
+            await asyncio.sleep(self.sleep_tune)
+        return self.my_serial.read(size)
+
     async def read_until(self, expected=LF, size=None, timeout=1):
         """
         This is an asyncio adapted version of pyserial read
@@ -210,5 +241,8 @@ class TelemetrixAioSerial:
         """
         Close the serial port
         """
+        # release the worker thread - a write already queued still
+        # finishes, without blocking the event loop here
+        self.tx_executor.shutdown(wait=False)
         if self.my_serial:
             self.my_serial.close()